@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+Command History Analytics for Desktop AI Agent
+Bulk statistics over parsed commands, kept off the interactive path
+"""
+
+from collections import Counter
+from typing import Dict, Iterable
+
+
+def category_action_counts(history: Iterable) -> Dict[str, Dict[str, int]]:
+    """
+    Count how often each action was parsed for each category
+
+    Args:
+        history: Parsed commands (anything with .category and .action)
+
+    Returns:
+        {category: {action: count}}
+    """
+    pairs = Counter((cmd.category, cmd.action) for cmd in history)
+    counts: Dict[str, Dict[str, int]] = {}
+    for (category, action), count in pairs.items():
+        counts.setdefault(category, {})[action] = count
+    return counts
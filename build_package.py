@@ -52,7 +52,7 @@ if windowed or (os.name == 'nt' and not '--console' in extra_args):
 # cmd_parts.append('--icon=assets/desktopai.ico')
 
 # Hidden imports that sometimes confuse PyInstaller
-hidden_imports = ['fuzzywuzzy.process', 'fuzzywuzzy.fuzz']
+hidden_imports = ['rapidfuzz.process', 'rapidfuzz.fuzz', 'fuzzywuzzy.process', 'fuzzywuzzy.fuzz']
 for hi in hidden_imports:
     cmd_parts.append(f"--hidden-import={hi}")
 
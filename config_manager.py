@@ -39,6 +39,7 @@ class AgentConfig:
     cpu_threshold: float = 80.0
     memory_threshold: float = 80.0
     disk_threshold: float = 85.0
+    alert_cooldown: int = 300  # seconds before a persisting alert repeats
     
     # Logging
     log_level: str = "INFO"
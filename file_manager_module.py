@@ -5,17 +5,107 @@ Handles file operations, organization, and management
 """
 
 import os
-import shutil
+import errno
+import heapq
 import subprocess
+import tarfile
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Any, List
 from datetime import datetime
 import logging
 
 from module_framework import BaseModule, ModuleResult, ResultStatus
+from file_utils import fast_move, name_matcher
 
 logger = logging.getLogger(__name__)
 
+# Parallel tree walks only pay off once there is enough fan-out
+PARALLEL_WALK_MIN_SUBDIRS = 4
+PARALLEL_WALK_MAX_WORKERS = 8
+
+# File type categories used by organize_downloads
+_CATEGORIES = {
+    "Documents": [".pdf", ".doc", ".docx", ".txt", ".xls", ".xlsx", ".ppt"],
+    "Images": [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".svg"],
+    "Videos": [".mp4", ".mkv", ".avi", ".mov", ".flv"],
+    "Audio": [".mp3", ".wav", ".flac", ".aac", ".ogg"],
+    "Archives": [".zip", ".rar", ".7z", ".tar", ".gz"],
+    "Code": [".py", ".js", ".java", ".cpp", ".c", ".html", ".css"],
+    "Executables": [".exe", ".sh", ".deb", ".rpm"]
+}
+
+# Flattened extension -> category lookup
+_EXT_TO_CATEGORY = {
+    ext: category
+    for category, extensions in _CATEGORIES.items()
+    for ext in extensions
+}
+
+# Image extensions handled by sort_photos
+_PHOTO_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png", ".gif", ".bmp"})
+
+
+def _walk(directory: str, topdown: bool = True):
+    """
+    Walk a directory tree, yielding (root, dirs, files, dir_fd).
+    On POSIX this uses os.fwalk so callers can stat/open/remove entries
+    relative to dir_fd (openat/fstatat) without re-resolving full paths.
+    Elsewhere it falls back to os.walk with dir_fd set to None.
+    """
+    if hasattr(os, "fwalk"):
+        yield from os.fwalk(directory, topdown=topdown)
+    else:
+        for root, dirs, files in os.walk(directory, topdown=topdown):
+            yield root, dirs, files, None
+
+
+def _iter_files(directory: str, recursive: bool = True):
+    """
+    Walk a directory tree with os.scandir and yield a DirEntry per file.
+    DirEntry caches stat results, so callers can read sizes and times
+    without an extra syscall. Symlinked directories are not followed and
+    unreadable directories are skipped, matching os.walk defaults.
+    """
+    stack = [directory]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if recursive:
+                                stack.append(entry.path)
+                        elif entry.is_file():
+                            yield entry
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+
+def _map_subdirs(directory: str, func):
+    """
+    Call func on each top-level subdirectory of directory and yield the
+    results in order. Wide trees are spread over a thread pool, since
+    directory and file I/O release the GIL; narrow ones run inline.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            subdirs = [e.path for e in entries if e.is_dir(follow_symlinks=False)]
+    except OSError:
+        return
+    
+    if len(subdirs) > PARALLEL_WALK_MIN_SUBDIRS:
+        workers = min(PARALLEL_WALK_MAX_WORKERS, len(subdirs))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            yield from pool.map(func, subdirs)
+    else:
+        for subdir in subdirs:
+            yield func(subdir)
+
 
 class FileManagerModule(BaseModule):
     """
@@ -93,18 +183,8 @@ class FileManagerModule(BaseModule):
                 data={}
             )
         
-        # File type categories
-        categories = {
-            "Documents": [".pdf", ".doc", ".docx", ".txt", ".xls", ".xlsx", ".ppt"],
-            "Images": [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".svg"],
-            "Videos": [".mp4", ".mkv", ".avi", ".mov", ".flv"],
-            "Audio": [".mp3", ".wav", ".flac", ".aac", ".ogg"],
-            "Archives": [".zip", ".rar", ".7z", ".tar", ".gz"],
-            "Code": [".py", ".js", ".java", ".cpp", ".c", ".html", ".css"],
-            "Executables": [".exe", ".sh", ".deb", ".rpm"]
-        }
-        
         organized = {}
+        created_dirs = set()
         
         for filename in os.listdir(downloads_dir):
             filepath = os.path.join(downloads_dir, filename)
@@ -113,21 +193,18 @@ class FileManagerModule(BaseModule):
                 ext = os.path.splitext(filename)[1].lower()
                 
                 # Find category
-                category = "Other"
-                for cat, extensions in categories.items():
-                    if ext in extensions:
-                        category = cat
-                        break
+                category = _EXT_TO_CATEGORY.get(ext, "Other")
                 
-                # Create category folder if needed
+                # Create category folder once per category
                 category_path = os.path.join(downloads_dir, category)
-                if not os.path.exists(category_path):
-                    os.makedirs(category_path)
+                if category_path not in created_dirs:
+                    os.makedirs(category_path, exist_ok=True)
+                    created_dirs.add(category_path)
                 
                 # Move file
                 try:
                     dest = os.path.join(category_path, filename)
-                    shutil.move(filepath, dest)
+                    fast_move(filepath, dest)
                     organized[category] = organized.get(category, 0) + 1
                 except Exception as e:
                     logger.warning(f"Failed to move {filename}: {e}")
@@ -151,23 +228,72 @@ class FileManagerModule(BaseModule):
                 data={}
             )
         
-        renamed = []
+        with os.scandir(directory) as it:
+            entries = sorted(it, key=lambda e: e.name)
+        
+        # Plan every rename up front
+        plan = []
         counter = start_num
+        for entry in entries:
+            if entry.is_file():
+                ext = os.path.splitext(entry.name)[1]
+                plan.append((entry, f"{pattern}{counter}{ext}"))
+                counter += 1
+        
+        moves = [(entry, new_name) for entry, new_name in plan if new_name != entry.name]
+        sources = {entry.name for entry, _ in moves}
+        
+        # Dry run: refuse to start if a rename would overwrite a file that is
+        # not itself being renamed away (renumbering 1.txt -> 2.txt is fine)
+        names = {entry.name for entry in entries}
+        conflicts = [new_name for _, new_name in moves
+                     if new_name in names and new_name not in sources]
+        
+        if conflicts:
+            return ModuleResult(
+                status=ResultStatus.FAILED,
+                message=f"Renaming would overwrite {len(conflicts)} existing files",
+                data={"conflicts": conflicts}
+            )
         
-        for filename in sorted(os.listdir(directory)):
-            filepath = os.path.join(directory, filename)
-            
-            if os.path.isfile(filepath):
-                ext = os.path.splitext(filename)[1]
-                new_name = f"{pattern}{counter}{ext}"
-                new_path = os.path.join(directory, new_name)
-                
-                try:
-                    os.rename(filepath, new_path)
-                    renamed.append({"old": filename, "new": new_name})
-                    counter += 1
-                except Exception as e:
-                    logger.warning(f"Failed to rename {filename}: {e}")
+        renamed = []
+        vacated = set()
+        
+        def rename(old_name, src, new_name):
+            try:
+                os.replace(src, os.path.join(directory, new_name))
+                renamed.append({"old": old_name, "new": new_name})
+                return True
+            except Exception as e:
+                logger.warning(f"Failed to rename {old_name}: {e}")
+                return False
+        
+        # Renames into free names go first and release their old names
+        for entry, new_name in moves:
+            if new_name not in sources and rename(entry.name, entry.path, new_name):
+                vacated.add(entry.name)
+        
+        # Chained renames (1.txt -> 2.txt -> 3.txt) go through temporary
+        # names so no file in the batch is overwritten along the way
+        staged = []
+        for entry, new_name in moves:
+            if new_name not in sources:
+                continue
+            fd, tmp = tempfile.mkstemp(prefix=".rename-", dir=directory)
+            os.close(fd)
+            try:
+                os.replace(entry.path, tmp)
+            except Exception as e:
+                os.unlink(tmp)
+                logger.warning(f"Failed to rename {entry.name}: {e}")
+                continue
+            vacated.add(entry.name)
+            staged.append((entry.name, tmp, new_name))
+        
+        for old_name, tmp, new_name in staged:
+            if new_name not in vacated or not rename(old_name, tmp, new_name):
+                # The target never freed up; put the file back where it was
+                os.replace(tmp, os.path.join(directory, old_name))
         
         return ModuleResult(
             status=ResultStatus.SUCCESS,
@@ -188,25 +314,38 @@ class FileManagerModule(BaseModule):
         
         # Hash files to find duplicates
         import hashlib
+        
+        def hash_tree(path, recursive=True):
+            hashed = []
+            for root, dirs, files, dir_fd in _walk(path):
+                if not recursive:
+                    dirs.clear()
+                prefix = root if root.endswith(os.sep) else root + os.sep
+                opener = lambda name, flags: os.open(name, flags, dir_fd=dir_fd)
+                for filename in files:
+                    filepath = prefix + filename
+                    
+                    try:
+                        with open(filename if dir_fd is not None else filepath, 'rb', opener=opener) as f:
+                            hashed.append((hashlib.md5(f.read()).hexdigest(), filepath))
+                    except Exception as e:
+                        logger.warning(f"Failed to hash {filepath}: {e}")
+            return hashed
+        
+        hashed = hash_tree(directory, recursive=False)
+        for subtree in _map_subdirs(directory, hash_tree):
+            hashed.extend(subtree)
+        
         file_hashes = {}
         duplicates = {}
         
-        for root, dirs, files in os.walk(directory):
-            for filename in files:
-                filepath = os.path.join(root, filename)
-                
-                try:
-                    with open(filepath, 'rb') as f:
-                        file_hash = hashlib.md5(f.read()).hexdigest()
-                    
-                    if file_hash in file_hashes:
-                        if file_hash not in duplicates:
-                            duplicates[file_hash] = [file_hashes[file_hash]]
-                        duplicates[file_hash].append(filepath)
-                    else:
-                        file_hashes[file_hash] = filepath
-                except Exception as e:
-                    logger.warning(f"Failed to hash {filepath}: {e}")
+        for file_hash, filepath in hashed:
+            if file_hash in file_hashes:
+                if file_hash not in duplicates:
+                    duplicates[file_hash] = [file_hashes[file_hash]]
+                duplicates[file_hash].append(filepath)
+            else:
+                file_hashes[file_hash] = filepath
         
         return ModuleResult(
             status=ResultStatus.SUCCESS,
@@ -227,11 +366,9 @@ class FileManagerModule(BaseModule):
             )
         
         try:
-            shutil.make_archive(
-                output.replace(".tar.gz", ""),
-                "gztar",
-                directory
-            )
+            # Fast gzip level favours throughput over archive size
+            with tarfile.open(output, "w:gz", compresslevel=1) as tar:
+                tar.add(directory, arcname=os.curdir)
             
             size = os.path.getsize(output)
             return ModuleResult(
@@ -259,27 +396,35 @@ class FileManagerModule(BaseModule):
             )
         
         sorted_count = 0
+        created_dirs = set()
         
-        for filename in os.listdir(directory):
-            filepath = os.path.join(directory, filename)
+        # Snapshot the listing since files are moved out while iterating
+        with os.scandir(directory) as it:
+            entries = list(it)
+        
+        for entry in entries:
+            filename = entry.name
+            filepath = entry.path
             
-            if os.path.isfile(filepath):
-                # Check if it's an image
-                if filename.lower().endswith(('.jpg', '.jpeg', '.png', '.gif', '.bmp')):
+            # Check if it's an image
+            if os.path.splitext(filename)[1].lower() in _PHOTO_EXTENSIONS:
+                if entry.is_file():
                     try:
-                        # Get file modification time
-                        mtime = os.path.getmtime(filepath)
+                        # Modification time from the DirEntry's cached stat
+                        mtime = entry.stat().st_mtime
                         date = datetime.fromtimestamp(mtime)
                         
                         # Create folder structure: Year/Month
                         year_folder = os.path.join(directory, str(date.year))
                         month_folder = os.path.join(year_folder, f"{date.month:02d}")
                         
-                        os.makedirs(month_folder, exist_ok=True)
+                        if month_folder not in created_dirs:
+                            os.makedirs(month_folder, exist_ok=True)
+                            created_dirs.add(month_folder)
                         
                         # Move file
                         dest = os.path.join(month_folder, filename)
-                        shutil.move(filepath, dest)
+                        fast_move(filepath, dest)
                         sorted_count += 1
                     except Exception as e:
                         logger.warning(f"Failed to sort {filename}: {e}")
@@ -302,6 +447,7 @@ class FileManagerModule(BaseModule):
             )
         
         moved = {}
+        created_dirs = set()
         
         for filename in os.listdir(directory):
             filepath = os.path.join(directory, filename)
@@ -312,11 +458,13 @@ class FileManagerModule(BaseModule):
                     ext = ext[1:]  # Remove dot
                     ext_folder = os.path.join(directory, ext)
                     
-                    os.makedirs(ext_folder, exist_ok=True)
+                    if ext_folder not in created_dirs:
+                        os.makedirs(ext_folder, exist_ok=True)
+                        created_dirs.add(ext_folder)
                     
                     try:
                         dest = os.path.join(ext_folder, filename)
-                        shutil.move(filepath, dest)
+                        fast_move(filepath, dest)
                         moved[ext] = moved.get(ext, 0) + 1
                     except Exception as e:
                         logger.warning(f"Failed to move {filename}: {e}")
@@ -340,20 +488,29 @@ class FileManagerModule(BaseModule):
             }
         
         created = []
+        leaves = []
         
-        def create_structure(base, struct):
+        def collect(base, struct):
+            # Flatten the structure; only leaf folders need a makedirs call
+            # since creating a leaf also creates its parents.
             for folder, subfolders in struct.items():
                 folder_path = os.path.join(base, folder)
-                os.makedirs(folder_path, exist_ok=True)
                 created.append(folder_path)
                 
-                if isinstance(subfolders, list):
+                if isinstance(subfolders, dict) and subfolders:
+                    collect(folder_path, subfolders)
+                elif isinstance(subfolders, list) and subfolders:
                     for subfolder in subfolders:
                         subfolder_path = os.path.join(folder_path, subfolder)
-                        os.makedirs(subfolder_path, exist_ok=True)
                         created.append(subfolder_path)
+                        leaves.append(subfolder_path)
+                else:
+                    leaves.append(folder_path)
         
-        create_structure(base_path, structure)
+        collect(base_path, structure)
+        
+        for leaf in leaves:
+            os.makedirs(leaf, exist_ok=True)
         
         return ModuleResult(
             status=ResultStatus.SUCCESS,
@@ -374,25 +531,28 @@ class FileManagerModule(BaseModule):
                 data={}
             )
         
-        large_files = []
-        
-        for root, dirs, files in os.walk(directory):
-            for filename in files:
-                filepath = os.path.join(root, filename)
+        def scan(path, recursive=True):
+            found = []
+            for entry in _iter_files(path, recursive):
                 try:
-                    size = os.path.getsize(filepath)
-                    if size >= min_size:
-                        large_files.append({
-                            "path": filepath,
-                            "size": size,
-                            "size_mb": size / (1024 * 1024)
-                        })
-                except Exception:
-                    pass
-        
-        # Sort by size and limit
-        large_files.sort(key=lambda x: x["size"], reverse=True)
-        large_files = large_files[:limit]
+                    size = entry.stat().st_size
+                except OSError:
+                    continue
+                if size >= min_size:
+                    found.append({
+                        "path": entry.path,
+                        "size": size,
+                        "size_mb": size / (1024 * 1024)
+                    })
+            return found
+        
+        def candidates():
+            yield from scan(directory, recursive=False)
+            for subtree in _map_subdirs(directory, scan):
+                yield from subtree
+        
+        # Keep only the top `limit` entries instead of sorting every match
+        large_files = heapq.nlargest(limit, candidates(), key=lambda x: x["size"])
         
         return ModuleResult(
             status=ResultStatus.SUCCESS,
@@ -413,15 +573,16 @@ class FileManagerModule(BaseModule):
         
         removed = []
         
-        for root, dirs, files in os.walk(directory, topdown=False):
+        for root, dirs, files, dir_fd in _walk(directory, topdown=False):
             for dirname in dirs:
                 dirpath = os.path.join(root, dirname)
                 try:
-                    if not os.listdir(dirpath):
-                        os.rmdir(dirpath)
-                        removed.append(dirpath)
-                except Exception as e:
-                    logger.warning(f"Failed to remove {dirpath}: {e}")
+                    # rmdir only succeeds on empty folders, so no listdir is needed
+                    os.rmdir(dirname if dir_fd is not None else dirpath, dir_fd=dir_fd)
+                    removed.append(dirpath)
+                except OSError as e:
+                    if e.errno not in (errno.ENOTEMPTY, errno.EEXIST):
+                        logger.warning(f"Failed to remove {dirpath}: {e}")
         
         return ModuleResult(
             status=ResultStatus.SUCCESS,
@@ -443,16 +604,19 @@ class FileManagerModule(BaseModule):
             )
         
         results = []
+        matches = name_matcher(pattern)
         
-        for root, dirs, files in os.walk(directory):
+        for root, dirs, files, dir_fd in _walk(directory):
+            prefix = root if root.endswith(os.sep) else root + os.sep
             for filename in files:
-                if pattern.lower() in filename.lower():
+                if matches(filename):
                     if file_type is None or filename.endswith(file_type):
-                        filepath = os.path.join(root, filename)
+                        filepath = prefix + filename
+                        stat_target = filename if dir_fd is not None else filepath
                         results.append({
                             "path": filepath,
                             "name": filename,
-                            "size": os.path.getsize(filepath)
+                            "size": os.stat(stat_target, dir_fd=dir_fd).st_size
                         })
         
         return ModuleResult(
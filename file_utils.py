@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+File Helpers for Desktop AI Agent
+Shared by the file manager module and folder_ops
+"""
+
+import os
+import re
+import errno
+import shutil
+import fnmatch
+
+
+def fast_move(src: str, dst: str):
+    """
+    Move a file, using an atomic rename when both paths share a filesystem.
+    Across filesystems the data is copied with shutil.copy2, which uses
+    sendfile(2)/fcopyfile in the kernel, and the source is then removed.
+    """
+    try:
+        os.replace(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.copy2(src, dst)
+        os.unlink(src)
+
+
+def name_matcher(pattern: str):
+    """
+    Build a case-insensitive file name predicate for a search pattern.
+    Wildcard patterns (* and ?) are compiled to a regex once; anything
+    else, including names with brackets, is a substring check against
+    the casefolded name.
+    """
+    if "*" in pattern or "?" in pattern:
+        regex = re.compile(fnmatch.translate(pattern), re.IGNORECASE)
+        return lambda name: regex.match(name) is not None
+    
+    needle = pattern.casefold()
+    return lambda name: needle in name.casefold()
@@ -2,28 +2,75 @@ import os
 import shutil
 import glob
 from datetime import datetime
-from navigation_state import navigator
+import time
+from collections import OrderedDict
+from navigation_state import get_navigator
+from file_utils import fast_move, name_matcher
+
+# ==================== DIRECTORY LISTING CACHE ====================
+
+LISTING_CACHE_TTL = 3.0  # seconds
+LISTING_CACHE_SIZE = 256
+
+# path -> (mtime_ns, generation, expires_at, folders, files), least recently used first
+_listing_cache = OrderedDict()
+# path -> counter bumped whenever this module writes into the directory
+_listing_generation = {}
+
+def _invalidate_listing(path):
+    """Mark the cached listing of a directory as stale after a local write"""
+    _listing_generation[path] = _listing_generation.get(path, 0) + 1
+
+def _scan_directory(path):
+    """Return (folders, files) in a directory, cached for a few seconds"""
+    mtime_ns = os.stat(path).st_mtime_ns
+    generation = _listing_generation.get(path, 0)
+    now = time.monotonic()
+    
+    cached = _listing_cache.get(path)
+    if cached and cached[0] == mtime_ns and cached[1] == generation and cached[2] > now:
+        _listing_cache.move_to_end(path)
+        return list(cached[3]), list(cached[4])
+    
+    folders = []
+    files = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                folders.append(entry.name)
+            elif entry.is_file():
+                files.append(entry.name)
+    
+    _listing_cache[path] = (mtime_ns, generation, now + LISTING_CACHE_TTL, folders, files)
+    _listing_cache.move_to_end(path)
+    if len(_listing_cache) > LISTING_CACHE_SIZE:
+        _listing_cache.popitem(last=False)
+    return list(folders), list(files)
 
 # ==================== NAVIGATION FUNCTIONS ====================
 
 def navigate_to(location):
     """Navigate to a specific location"""
+    navigator = get_navigator()
     success, message = navigator.navigate_to(location)
     return message
 
 def go_back():
     """Go back to previous directory"""
+    navigator = get_navigator()
     success, message = navigator.go_back()
     return message
 
 def get_current_location():
     """Get current location info"""
+    navigator = get_navigator()
     current_path = navigator.get_current_path()
     current_name = navigator.get_current_path_name()
     return f"Currently in: {current_name} ({current_path})"
 
 def list_main_folders():
     """List main system folders"""
+    navigator = get_navigator()
     main_folders = navigator.get_main_folders()
     return list(main_folders.keys())
 
@@ -31,44 +78,50 @@ def list_main_folders():
 
 def create_folder(folder_name, location=None):
     """Create a folder at specified location or current location"""
+    navigator = get_navigator()
     if location:
         success, message = navigator.navigate_to(location)
         if not success:
             return message
     
     current_path = navigator.get_current_path()
+    current_name = navigator.get_current_path_name()
     folder_path = os.path.join(current_path, folder_name)
     
     try:
         if not os.path.exists(folder_path):
             os.makedirs(folder_path)
-            return f"Folder '{folder_name}' created in {navigator.get_current_path_name()}"
+            _invalidate_listing(current_path)
+            return f"Folder '{folder_name}' created in {current_name}"
         else:
-            return f"Folder '{folder_name}' already exists in {navigator.get_current_path_name()}"
+            return f"Folder '{folder_name}' already exists in {current_name}"
     except Exception as e:
         return f"Error creating folder: {str(e)}"
 
 def delete_folder(folder_name):
     """Delete a folder from current location"""
+    navigator = get_navigator()
     current_path = navigator.get_current_path()
+    current_name = navigator.get_current_path_name()
     folder_path = os.path.join(current_path, folder_name)
     
     try:
         if os.path.exists(folder_path) and os.path.isdir(folder_path):
             shutil.rmtree(folder_path)  # Delete folder and all contents
-            return f"Folder '{folder_name}' deleted from {navigator.get_current_path_name()}"
+            _invalidate_listing(current_path)
+            return f"Folder '{folder_name}' deleted from {current_name}"
         else:
-            return f"Folder '{folder_name}' does not exist in {navigator.get_current_path_name()}"
+            return f"Folder '{folder_name}' does not exist in {current_name}"
     except Exception as e:
         return f"Error deleting folder: {str(e)}"
 
 def list_folders():
     """List folders in current location"""
+    navigator = get_navigator()
     current_path = navigator.get_current_path()
     
     try:
-        items = os.listdir(current_path)
-        folders = [f for f in items if os.path.isdir(os.path.join(current_path, f))]
+        folders, _ = _scan_directory(current_path)
         
         if not folders:
             return f"No folders found in {navigator.get_current_path_name()}"
@@ -81,6 +134,7 @@ def list_folders():
 
 def create_file(file_name, content="", location=None):
     """Create a file at specified location or current location"""
+    navigator = get_navigator()
     if location:
         success, message = navigator.navigate_to(location)
         if not success:
@@ -92,31 +146,35 @@ def create_file(file_name, content="", location=None):
     try:
         with open(file_path, 'w') as f:
             f.write(content)
+        _invalidate_listing(current_path)
         return f"File '{file_name}' created in {navigator.get_current_path_name()}"
     except Exception as e:
         return f"Error creating file: {str(e)}"
 
 def delete_file(file_name):
     """Delete a file from current location"""
+    navigator = get_navigator()
     current_path = navigator.get_current_path()
+    current_name = navigator.get_current_path_name()
     file_path = os.path.join(current_path, file_name)
     
     try:
         if os.path.exists(file_path) and os.path.isfile(file_path):
             os.remove(file_path)
-            return f"File '{file_name}' deleted from {navigator.get_current_path_name()}"
+            _invalidate_listing(current_path)
+            return f"File '{file_name}' deleted from {current_name}"
         else:
-            return f"File '{file_name}' does not exist in {navigator.get_current_path_name()}"
+            return f"File '{file_name}' does not exist in {current_name}"
     except Exception as e:
         return f"Error deleting file: {str(e)}"
 
 def list_files():
     """List files in current location"""
+    navigator = get_navigator()
     current_path = navigator.get_current_path()
     
     try:
-        items = os.listdir(current_path)
-        files = [f for f in items if os.path.isfile(os.path.join(current_path, f))]
+        _, files = _scan_directory(current_path)
         
         if not files:
             return f"No files found in {navigator.get_current_path_name()}"
@@ -127,12 +185,12 @@ def list_files():
 
 def list_all():
     """List both files and folders in current location"""
+    navigator = get_navigator()
     current_path = navigator.get_current_path()
     
     try:
-        items = os.listdir(current_path)
-        folders = [f + "/" for f in items if os.path.isdir(os.path.join(current_path, f))]
-        files = [f for f in items if os.path.isfile(os.path.join(current_path, f))]
+        folders, files = _scan_directory(current_path)
+        folders = [f + "/" for f in folders]
         
         all_items = folders + files
         
@@ -145,12 +203,14 @@ def list_all():
 
 def move_file(file_name, destination):
     """Move a file to another location"""
+    navigator = get_navigator()
     current_path = navigator.get_current_path()
     source_path = os.path.join(current_path, file_name)
     
     # Handle destination
-    if destination in navigator.get_main_folders():
-        dest_path = navigator.get_main_folders()[destination]
+    main_folders = navigator.get_main_folders()
+    if destination in main_folders:
+        dest_path = main_folders[destination]
     elif os.path.isabs(destination):
         dest_path = destination
     else:
@@ -165,13 +225,16 @@ def move_file(file_name, destination):
         if not os.path.exists(dest_path):
             return f"Destination '{destination}' does not exist"
         
-        shutil.move(source_path, final_dest)
+        fast_move(source_path, final_dest)
+        _invalidate_listing(current_path)
+        _invalidate_listing(dest_path)
         return f"File '{file_name}' moved to {destination}"
     except Exception as e:
         return f"Error moving file: {str(e)}"
 
 def rename_file(old_name, new_name):
     """Rename a file in current location"""
+    navigator = get_navigator()
     current_path = navigator.get_current_path()
     old_path = os.path.join(current_path, old_name)
     new_path = os.path.join(current_path, new_name)
@@ -184,27 +247,32 @@ def rename_file(old_name, new_name):
             return f"File '{new_name}' already exists in current location"
         
         os.rename(old_path, new_path)
+        _invalidate_listing(current_path)
         return f"File renamed from '{old_name}' to '{new_name}'"
     except Exception as e:
         return f"Error renaming file: {str(e)}"
 
 def search_files(pattern, search_in_subfolders=False):
     """Search for files matching a pattern"""
+    navigator = get_navigator()
     current_path = navigator.get_current_path()
     
+    # Prepare the matcher once instead of lowercasing the pattern per file
+    matches_pattern = name_matcher(pattern)
+    
     try:
         if search_in_subfolders:
             # Recursive search
             matches = []
             for root, dirs, files in os.walk(current_path):
                 for file in files:
-                    if pattern.lower() in file.lower():
+                    if matches_pattern(file):
                         rel_path = os.path.relpath(os.path.join(root, file), current_path)
                         matches.append(rel_path)
         else:
             # Search only in current directory
-            files = [f for f in os.listdir(current_path) if os.path.isfile(os.path.join(current_path, f))]
-            matches = [f for f in files if pattern.lower() in f.lower()]
+            _, files = _scan_directory(current_path)
+            matches = [f for f in files if matches_pattern(f)]
         
         if not matches:
             search_scope = "current folder and subfolders" if search_in_subfolders else "current folder"
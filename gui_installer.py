@@ -1,10 +1,14 @@
 #!/usr/bin/env python3
+import codecs
 import threading
 import subprocess
 import sys
 import tkinter as tk
 from tkinter import scrolledtext, messagebox
 
+READ_CHUNK_SIZE = 65536
+FLUSH_INTERVAL_MS = 50
+
 def run_setup(venv='.venv', install_system=False, no_venv=False):
     cmd = [sys.executable, 'auto_setup.py']
     if no_venv:
@@ -50,8 +54,22 @@ class InstallerGUI:
         self.output.pack(fill='both', expand=True, padx=10, pady=10)
 
         self.proc = None
+        self._buf = []
+        self._pending = False
 
     def append(self, text):
+        # Coalesce output and redraw at most once per FLUSH_INTERVAL_MS
+        self._buf.append(text)
+        if not self._pending:
+            self._pending = True
+            self.root.after(FLUSH_INTERVAL_MS, self._flush)
+
+    def _flush(self):
+        self._pending = False
+        if not self._buf:
+            return
+        text = ''.join(self._buf)
+        self._buf.clear()
         self.output.insert(tk.END, text)
         self.output.see(tk.END)
 
@@ -65,18 +83,31 @@ class InstallerGUI:
                 if not messagebox.askyesno('Confirm', 'System package installation requested but this is not Linux. Continue with python packages only?'):
                     return
 
+        self._buf.clear()
         self.output.delete('1.0', tk.END)
         self.append(f'Starting setup: venv={venv}, install_system={install_system}, no_venv={no_venv}\n')
 
         def run():
+            # Read whatever output is available in large chunks and hand it to
+            # the Tk main loop; widgets are never touched from this thread.
             try:
                 self.proc = run_setup(venv=venv, install_system=install_system, no_venv=no_venv)
-                for line in self.proc.stdout:
-                    self.append(line)
+                stream = self.proc.stdout.buffer
+                decoder = codecs.getincrementaldecoder(self.proc.stdout.encoding)(errors='replace')
+                while True:
+                    chunk = stream.read1(READ_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    text = decoder.decode(chunk)
+                    if text:
+                        self.root.after(0, self.append, text)
+                tail = decoder.decode(b'', final=True)
+                if tail:
+                    self.root.after(0, self.append, tail)
                 self.proc.wait()
-                self.append(f'\nSetup finished with exit code {self.proc.returncode}\n')
+                self.root.after(0, self.append, f'\nSetup finished with exit code {self.proc.returncode}\n')
             except Exception as e:
-                self.append(f'Setup failed: {e}\n')
+                self.root.after(0, self.append, f'Setup failed: {e}\n')
 
         thread = threading.Thread(target=run, daemon=True)
         thread.start()
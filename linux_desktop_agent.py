@@ -4,38 +4,155 @@ Linux Desktop AI Agent - Main Integration
 Intelligent desktop automation using Llama
 """
 
+import re
 import sys
 import json
+import time
+import atexit
+import queue
+import functools
+import importlib
 import logging
+import logging.handlers
 import argparse
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
 
 # Import core components
 from llama_integration import LlamaIntegration, CommandParsed
 from module_framework import get_registry, ModuleResult, ResultStatus
+from analytics import category_action_counts
 
-# Import all modules
-from system_cleanup_module import SystemCleanupModule
-from system_monitor_module import SystemMonitorModule
-from network_module import NetworkModule
-from file_manager_module import FileManagerModule
-from package_manager_module import PackageManagerModule
-from security_module import SecurityModule
-from developer_tools_module import DeveloperToolsModule
-from automation_module import AutomationModule
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('/tmp/linux_desktop_agent.log'),
-        logging.StreamHandler()
+# Modules registered at startup as (module path, class name); they are
+# imported inside _register_modules so `--help` and argument errors don't
+# pay for loading every module and its dependencies.
+MODULE_CLASSES = [
+    ("system_cleanup_module", "SystemCleanupModule"),
+    ("system_monitor_module", "SystemMonitorModule"),
+    ("network_module", "NetworkModule"),
+    ("file_manager_module", "FileManagerModule"),
+    ("package_manager_module", "PackageManagerModule"),
+    ("security_module", "SecurityModule"),
+    ("developer_tools_module", "DeveloperToolsModule"),
+    ("automation_module", "AutomationModule"),
+]
+
+logger = logging.getLogger(__name__)
+
+
+# Common phrasings answered without an LLM round-trip:
+# (pattern over the whole command, category, action)
+_FAST_RULES: List[Tuple[re.Pattern, str, str]] = [
+    (re.compile(pattern, re.IGNORECASE), category, action)
+    for pattern, category, action in [
+        (r"(check|show|get|what'?s|what is)( my| the)?( system)? (health|status)",
+         "monitoring", "get_system_health"),
+        (r"(check|show|get|what'?s|what is)( my| the)? disk( usage| space)?",
+         "monitoring", "get_disk_info"),
+        (r"(check|show|get|what'?s|what is)( my| the)? (memory|ram)( usage)?",
+         "monitoring", "get_memory_info"),
+        (r"(check|show|get|what'?s|what is)( my| the)? cpu( usage| info)?",
+         "monitoring", "get_cpu_info"),
+        (r"(check|show|get|what'?s|what is)( my| the)? battery( status| level)?",
+         "monitoring", "get_battery_status"),
+        (r"(check|show|get|what'?s|what is)( my| the)? (cpu )?temperature",
+         "monitoring", "get_temperature"),
+        (r"(test|check)( my| the)? (internet|network)( connection| connectivity)?",
+         "network", "test_connectivity"),
+        (r"(run )?(a |an )?(internet |network )?speed ?test",
+         "network", "speed_test"),
+        (r"check for( package| system)? updates",
+         "package_management", "check_updates"),
+        (r"empty( the| my)? trash",
+         "cleanup", "empty_trash"),
     ]
+]
+_FAST_RULE_CONFIDENCE = 0.95
+
+# Seconds a system health snapshot is reused by the "status" command
+STATUS_CACHE_TTL = 2.0
+
+# Console text rendered once at import time
+_BANNER = "=" * 60
+_SEP = "-" * 60
+_RESULT_TOP = "\n" + _SEP
+_RESULT_BOTTOM = _SEP + "\n"
+_INTERACTIVE_HEADER = (
+    f"\n{_BANNER}\nLinux Desktop AI Agent - Interactive Mode\n{_BANNER}\n"
+    "Type 'help' for commands, 'quit' to exit\n"
 )
-logger = logging.getLogger(__name__)
+_STATUS_HEADER = f"\n{_BANNER}\nSystem Status\n{_BANNER}"
+_MODULES_HEADER = f"\n{_BANNER}\nAvailable Modules\n{_BANNER}"
+_HELP_TEXT = """
+Available Commands:
+  help              - Show this help message
+  status            - Show system status
+  modules           - List available modules
+  quit              - Exit the agent
+
+Example Commands:
+  "check my system health"
+  "clean up my downloads folder"
+  "install python3-pip"
+  "what's my disk usage"
+  "organize my photos by date"
+  "test internet connectivity"
+  "find large files in my home"
+  "scan for security issues"
+  "check for updates"
+
+Natural Language Processing:
+  The agent understands natural language commands and will:
+  1. Parse your intent
+  2. Extract parameters
+  3. Route to appropriate module
+  4. Execute the action
+  5. Return results
+        """
+
+
+def ttl_cache(seconds: float):
+    """
+    Cache the result of a no-argument method per instance for `seconds`
+    
+    Falsy results are not cached.
+    """
+    def decorator(func):
+        attr = f"_{func.__name__}_cache"
+        
+        @functools.wraps(func)
+        def wrapper(self):
+            now = time.monotonic()
+            cached_at, value = getattr(self, attr, (0.0, None))
+            if value and now - cached_at < seconds:
+                return value
+            value = func(self)
+            setattr(self, attr, (now, value))
+            return value
+        
+        return wrapper
+    return decorator
+
+
+def _to_json(obj: Any) -> str:
+    """Pretty-print obj as JSON, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(
+                obj,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+                default=str
+            ).decode()
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits; let the stdlib handle it
+    return json.dumps(obj, indent=2, default=str)
 
 
 class LinuxDesktopAgent:
@@ -57,6 +174,10 @@ class LinuxDesktopAgent:
         # Register all modules
         self._register_modules()
         
+        # category -> module, valid for one registry generation
+        self._category_modules: Dict[str, Any] = {}
+        self._category_generation = self.registry.generation
+        
         # Configuration
         self.config_dir = Path.home() / ".config" / "linux-desktop-agent"
         self.config_dir.mkdir(parents=True, exist_ok=True)
@@ -65,21 +186,26 @@ class LinuxDesktopAgent:
     
     def _register_modules(self):
         """Register all available modules"""
-        modules = [
-            SystemCleanupModule(),
-            SystemMonitorModule(),
-            NetworkModule(),
-            FileManagerModule(),
-            PackageManagerModule(),
-            SecurityModule(),
-            DeveloperToolsModule(),
-            AutomationModule()
-        ]
-        
-        for module in modules:
+        for module_path, class_name in MODULE_CLASSES:
+            module_class = getattr(importlib.import_module(module_path), class_name)
+            module = module_class()
             self.registry.register(module)
             logger.info(f"Registered module: {module.name}")
     
+    def _module_for_category(self, category: str):
+        """Look up the module handling a category, caching the answer"""
+        if self._category_generation != self.registry.generation:
+            self._category_modules.clear()
+            self._category_generation = self.registry.generation
+        
+        category = category.lower()
+        module = self._category_modules.get(category)
+        if module is None:
+            module = self.registry.get_module_by_category(category)
+            if module:
+                self._category_modules[category] = module
+        return module
+    
     def process_command(self, user_input: str) -> Dict[str, Any]:
         """
         Process user command
@@ -92,9 +218,62 @@ class LinuxDesktopAgent:
         """
         logger.info(f"Processing command: {user_input}")
         
-        # Parse command using Llama
-        parsed = self.llama.parse_command(user_input)
+        # Parse command using Llama unless a fast-path rule matches
+        parsed = self._fast_parse(user_input) or self.llama.parse_command(user_input)
+        
+        return self._process_parsed(user_input, parsed)
+    
+    def process_commands(self, user_inputs: List[str]) -> List[Dict[str, Any]]:
+        """
+        Process several commands
         
+        The LLM parses for all commands run concurrently up front; the
+        resulting actions are then executed one by one, in order.
+        
+        Args:
+            user_inputs: User's natural language commands
+            
+        Returns:
+            Result dictionaries, in input order
+        """
+        logger.info(f"Processing {len(user_inputs)} commands")
+        
+        parsed_commands = [self._fast_parse(user_input) for user_input in user_inputs]
+        pending = [i for i, parsed in enumerate(parsed_commands) if parsed is None]
+        if pending:
+            llm_parsed = self.llama.parse_commands([user_inputs[i] for i in pending])
+            for i, parsed in zip(pending, llm_parsed):
+                parsed_commands[i] = parsed
+        
+        return [
+            self._process_parsed(user_input, parsed)
+            for user_input, parsed in zip(user_inputs, parsed_commands)
+        ]
+    
+    def _fast_parse(self, user_input: str) -> Optional[CommandParsed]:
+        """
+        Parse common fixed phrasings without asking the LLM
+        
+        Returns:
+            Parsed command, or None if no fast-path rule matches
+        """
+        text = " ".join(user_input.split()).rstrip("?.!")
+        for pattern, category, action in _FAST_RULES:
+            if pattern.fullmatch(text):
+                parsed = CommandParsed(
+                    action=action,
+                    category=category,
+                    parameters={},
+                    confidence=_FAST_RULE_CONFIDENCE,
+                    raw_input=user_input,
+                    timestamp=datetime.now()
+                )
+                self.llama.command_history.append(parsed)
+                return parsed
+        return None
+    
+    def _process_parsed(self, user_input: str, parsed: CommandParsed) -> Dict[str, Any]:
+        """Route a parsed command to its module and execute it"""
         if parsed.confidence < 0.3:
             # Ask for clarification
             question, suggestions = self.llama.handle_unclear_command(user_input)
@@ -116,7 +295,7 @@ class LinuxDesktopAgent:
             }
 
         # Get module for this command category
-        module = self.registry.get_module_by_category(parsed.category)
+        module = self._module_for_category(parsed.category)
         
         if not module:
             return {
@@ -145,10 +324,7 @@ class LinuxDesktopAgent:
     
     def interactive_mode(self):
         """Run interactive command loop"""
-        print("\n" + "="*60)
-        print("Linux Desktop AI Agent - Interactive Mode")
-        print("="*60)
-        print("Type 'help' for commands, 'quit' to exit\n")
+        print(_INTERACTIVE_HEADER)
         
         while True:
             try:
@@ -186,44 +362,23 @@ class LinuxDesktopAgent:
     
     def _show_help(self):
         """Show help information"""
-        help_text = """
-Available Commands:
-  help              - Show this help message
-  status            - Show system status
-  modules           - List available modules
-  quit              - Exit the agent
-
-Example Commands:
-  "check my system health"
-  "clean up my downloads folder"
-  "install python3-pip"
-  "what's my disk usage"
-  "organize my photos by date"
-  "test internet connectivity"
-  "find large files in my home"
-  "scan for security issues"
-  "check for updates"
-
-Natural Language Processing:
-  The agent understands natural language commands and will:
-  1. Parse your intent
-  2. Extract parameters
-  3. Route to appropriate module
-  4. Execute the action
-  5. Return results
-        """
-        print(help_text)
+        print(_HELP_TEXT)
+    
+    @ttl_cache(STATUS_CACHE_TTL)
+    def _fetch_health(self) -> Optional[ModuleResult]:
+        """Fetch system health from the monitor module (briefly cached)"""
+        monitor = self.registry.get_module("system_monitor")
+        if not monitor:
+            return None
+        return monitor.execute("get_system_health", {})
     
     def _show_status(self):
         """Show system status"""
-        print("\n" + "="*60)
-        print("System Status")
-        print("="*60)
+        print(_STATUS_HEADER)
         
         # Get system health
-        monitor = self.registry.get_module("system_monitor")
-        if monitor:
-            result = monitor.execute("get_system_health", {})
+        result = self._fetch_health()
+        if result:
             if result.status == ResultStatus.SUCCESS:
                 health = result.data
                 print(f"Health Score: {health.get('health_score', 'N/A')}/100")
@@ -236,9 +391,7 @@ Natural Language Processing:
     
     def _list_modules(self):
         """List all available modules"""
-        print("\n" + "="*60)
-        print("Available Modules")
-        print("="*60)
+        print(_MODULES_HEADER)
         
         modules = self.registry.list_modules()
         for module in modules:
@@ -250,7 +403,7 @@ Natural Language Processing:
     
     def _print_result(self, result: Dict[str, Any]):
         """Pretty print result"""
-        print("\n" + "-"*60)
+        print(_RESULT_TOP)
         print(f"Status: {result.get('status', 'unknown').upper()}")
         print(f"Message: {result.get('message', 'No message')}")
         
@@ -267,11 +420,11 @@ Natural Language Processing:
             print(f"Error: {result['error']}")
         
         if result.get('data'):
-            print(f"Data: {json.dumps(result['data'], indent=2, default=str)}")
+            print(f"Data: {_to_json(result['data'])}")
         
         if result.get('execution_time'):
             print(f"Execution Time: {result['execution_time']:.2f}s")
-        print("-"*60 + "\n")
+        print(_RESULT_BOTTOM)
     
     def get_stats(self) -> Dict[str, Any]:
         """Get agent statistics"""
@@ -279,6 +432,7 @@ Natural Language Processing:
             "timestamp": datetime.now().isoformat(),
             "modules": self.registry.get_stats(),
             "learning_patterns": self.llama.get_learning_stats(),
+            "category_actions": category_action_counts(self.llama.command_history),
             "command_history_count": len(self.llama.command_history)
         }
     
@@ -287,6 +441,34 @@ Natural Language Processing:
         return self.llama.explain_error(error_message)
 
 
+def _configure_logging():
+    """
+    Send log records to the log file and console through a queue
+    
+    Records are queued on the calling thread and written by a background
+    listener, keeping file I/O off the command path. Done in main() only,
+    since it replaces the root handlers (llama_integration sets its own at
+    import) and starts a thread.
+    """
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    handlers = [
+        logging.FileHandler('/tmp/linux_desktop_agent.log'),
+        logging.StreamHandler()
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers)
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(message)s',  # full formatting happens in the listener
+        handlers=[logging.handlers.QueueHandler(log_queue)],
+        force=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+
+
 def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(
@@ -315,6 +497,7 @@ def main():
     
     args = parser.parse_args()
     
+    _configure_logging()
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
@@ -324,7 +507,7 @@ def main():
     # Show stats if requested
     if args.stats:
         stats = agent.get_stats()
-        print(json.dumps(stats, indent=2, default=str))
+        print(_to_json(stats))
         return
     
     # Interactive mode if no command
@@ -336,7 +519,7 @@ def main():
     result = agent.process_command(args.command)
     
     if args.json:
-        print(json.dumps(result, indent=2, default=str))
+        print(_to_json(result))
     else:
         agent._print_result(result)
 
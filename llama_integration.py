@@ -7,13 +7,74 @@ Handles communication with locally installed Llama model
 import subprocess
 import json
 import logging
+import math
 import re
+import asyncio
+import atexit
+import hashlib
+import threading
 import requests
-from typing import Dict, List, Optional, Tuple
+from requests.adapters import HTTPAdapter
+from collections import Counter, OrderedDict, deque
+from itertools import islice
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from json_repair import repair_json
+    JSON_REPAIR_AVAILABLE = True
+except ImportError:
+    JSON_REPAIR_AVAILABLE = False
+
+try:
+    from packaging.version import Version, InvalidVersion
+    PACKAGING_AVAILABLE = True
+except ImportError:
+    PACKAGING_AVAILABLE = False
+
 SUPPORTED_OLLAMA_VERSION = "0.13.0"
+EMBEDDING_MODEL = "nomic-embed-text"
+PARSE_CACHE_SIZE = 1024
+COMMAND_HISTORY_SIZE = 10000
+MAX_CONCURRENT_QUERIES = 4
+# How long Ollama keeps the model (and its prompt KV cache) loaded between calls
+OLLAMA_KEEP_ALIVE = "10m"
+
+# numpy module once imported, False if it isn't installed; loaded on the first
+# semantic lookup so importing this module stays cheap
+_numpy = None
+
+def _load_numpy():
+    """Import numpy on first use; None if it isn't installed"""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy or None
+
+# Model responses are parsed with orjson when available; its decode error
+# subclasses json.JSONDecodeError so callers handle both the same way.
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+_VERSION_RE = re.compile(r"(\d+\.\d+\.\d+(?:-?(?:rc|alpha|beta|a|b)\.?\d*)?)")
+_LEADING_DIGITS_RE = re.compile(r"\d*")
+
+VALID_CATEGORIES = (
+    "system_control", "file_management", "package_management",
+    "security", "network", "monitoring", "developer",
+    "automation", "cleanup", "help"
+)
 
 # Configure logging
 logging.basicConfig(
@@ -34,12 +95,275 @@ class CommandParsed:
     timestamp: datetime
 
 
+class _JsonObjectScanner:
+    """
+    Incremental brace-depth scanner
+    Finds where the first top-level JSON object ends in streamed text,
+    ignoring braces inside string literals.
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.started = False
+        self.in_string = False
+        self.escape = False
+        self.position = 0
+
+    def feed(self, text: str) -> int:
+        """
+        Consume more text
+        
+        Returns:
+            Offset just past the closing brace of the first object, counted
+            over all text fed so far, or -1 if it is not complete yet
+        """
+        for char in text:
+            self.position += 1
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif char == "\\":
+                    self.escape = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == "{":
+                self.depth += 1
+                self.started = True
+            elif not self.started:
+                continue
+            elif char == '"':
+                self.in_string = True
+            elif char == "}":
+                self.depth -= 1
+                if self.depth == 0:
+                    return self.position
+        return -1
+
+
+def _pack_version(version: str) -> int:
+    """
+    Pack major.minor.patch into one integer (20 bits per component)
+    
+    Packed versions order the same way as their (major, minor, patch)
+    tuples, so comparing two versions is a single integer comparison.
+    Non-numeric suffixes such as "-rc1" are ignored.
+    """
+    parts = [int(_LEADING_DIGITS_RE.match(part).group() or 0) for part in version.split(".")[:3]]
+    parts += [0] * (3 - len(parts))
+    major, minor, patch = (min(part, 0xFFFFF) for part in parts)
+    return (major << 40) | (minor << 20) | patch
+
+
+_SUPPORTED_VERSION_PACKED = _pack_version(SUPPORTED_OLLAMA_VERSION)
+
+
+def _extract_json(text: str) -> Optional[str]:
+    """
+    Return the first complete top-level JSON object embedded in text
+    
+    Single forward pass with brace-depth tracking, so responses that wrap
+    the JSON in prose or markdown fences don't need a backtracking regex.
+    """
+    start = text.find("{")
+    if start < 0:
+        return None
+    end = _JsonObjectScanner().feed(text[start:])
+    if end < 0:
+        return None
+    return text[start:start + end]
+
+
+def _load_json_object(text: str) -> Optional[Dict]:
+    """
+    Decode the JSON object in a model response
+    
+    Clean JSON (the common case in JSON mode) is decoded directly; only on
+    failure is an object searched for inside surrounding text, and then
+    handed to json_repair (when installed) as a last resort.
+    
+    Returns:
+        The decoded object, or None if none could be recovered
+    """
+    try:
+        data = _json_loads(text)
+        if isinstance(data, dict):
+            return data
+    except json.JSONDecodeError:
+        pass
+    
+    json_text = _extract_json(text)
+    if json_text:
+        try:
+            return _json_loads(json_text)
+        except json.JSONDecodeError:
+            pass
+    
+    if JSON_REPAIR_AVAILABLE and text.strip():
+        try:
+            data = _json_loads(repair_json(text))
+        except (json.JSONDecodeError, ValueError):
+            return None
+        if isinstance(data, dict) and data:
+            return data
+    return None
+
+
+class PromptCache:
+    """
+    Two-tier cache for LLM responses
+    Exact prompts are served from an LRU dict; on a miss, prompts that share
+    the same template are compared by embedding and the closest cached
+    response is reused when its cosine similarity clears the threshold.
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_entries: int = 512,
+                 similarity_threshold: float = 0.93):
+        """
+        Initialize prompt cache
+        
+        Args:
+            path: Optional JSON file used to persist the cache across runs
+            max_entries: Maximum number of cached responses
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        # key -> (response, scope, normalized embedding or None)
+        self._entries: "OrderedDict[str, Tuple[str, Optional[str], Optional[List[float]]]]" = OrderedDict()
+        # scope -> (keys, matrix) snapshot used for vectorized lookups
+        self._matrices: Dict[str, Tuple[List[str], object]] = {}
+        # Guards the entries; queries may run concurrently (parse_commands)
+        self._lock = threading.RLock()
+        self._load()
+
+    # One cache per file for the whole process, so each file is loaded once
+    # and written once at exit rather than by every LlamaIntegration
+    _shared: Dict[Path, "PromptCache"] = {}
+    _shared_lock = threading.Lock()
+
+    @classmethod
+    def for_path(cls, path: Path) -> "PromptCache":
+        """Return the process-wide cache persisted at path, saved at exit"""
+        with cls._shared_lock:
+            cache = cls._shared.get(path)
+            if cache is None:
+                cache = cls._shared[path] = cls(path)
+                atexit.register(cache.save)
+            return cache
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """Build a stable cache key from prompt components"""
+        return hashlib.sha1("\0".join(parts).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _normalize(vector: List[float]) -> Optional[List[float]]:
+        norm = math.sqrt(sum(x * x for x in vector))
+        if not norm:
+            return None
+        return [x / norm for x in vector]
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for an exact key"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def get_similar(self, scope: str, embedding: List[float]) -> Optional[str]:
+        """Return the closest cached response within scope, if similar enough"""
+        query = self._normalize(embedding)
+        if query is None:
+            return None
+        
+        best_key, best_score = None, -1.0
+        np = _load_numpy()
+        with self._lock:
+            if np is not None:
+                if scope not in self._matrices:
+                    keys = [k for k, e in self._entries.items() if e[1] == scope and e[2] is not None]
+                    matrix = np.array([self._entries[k][2] for k in keys], dtype=np.float32) if keys else None
+                    self._matrices[scope] = (keys, matrix)
+                keys, matrix = self._matrices[scope]
+                if matrix is not None and matrix.shape[1] == len(query):
+                    scores = matrix @ np.asarray(query, dtype=np.float32)
+                    index = int(scores.argmax())
+                    best_key, best_score = keys[index], float(scores[index])
+            else:
+                for key, (_, entry_scope, vector) in self._entries.items():
+                    if entry_scope != scope or vector is None or len(vector) != len(query):
+                        continue
+                    score = sum(a * b for a, b in zip(vector, query))
+                    if score > best_score:
+                        best_key, best_score = key, score
+            
+            if best_key is not None and best_score >= self.similarity_threshold:
+                logger.debug(f"Semantic cache hit (similarity {best_score:.3f})")
+                return self.get(best_key)
+        return None
+
+    def put(self, key: str, response: str, scope: Optional[str] = None,
+            embedding: Optional[List[float]] = None):
+        """Store a response, evicting the least recently used entry if full"""
+        vector = self._normalize(embedding) if embedding else None
+        with self._lock:
+            self._entries[key] = (response, scope, vector)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._matrices.clear()
+            if scope is not None:
+                self._matrices.pop(scope, None)
+
+    def clear(self):
+        """Drop all cached responses"""
+        with self._lock:
+            self._entries.clear()
+            self._matrices.clear()
+
+    def save(self):
+        """Persist the cache to disk"""
+        if self.path is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._lock:
+                entries = [
+                    {"key": key, "response": response, "scope": scope, "embedding": vector}
+                    for key, (response, scope, vector) in self._entries.items()
+                ]
+            with open(self.path, "w") as f:
+                json.dump({"entries": entries}, f)
+        except Exception as e:
+            logger.warning(f"Failed to save prompt cache: {e}")
+
+    def _load(self):
+        """Load a persisted cache from disk"""
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            for entry in data.get("entries", [])[-self.max_entries:]:
+                self._entries[entry["key"]] = (entry["response"], entry.get("scope"), entry.get("embedding"))
+        except Exception as e:
+            logger.warning(f"Failed to load prompt cache: {e}")
+
+
 class LlamaIntegration:
     """
     Manages communication with Llama model for NLP processing
     Requires: ollama installed and running locally
     """
 
+    # Ollama version detection is shared by every instance in the process
+    _version_lock = threading.Lock()
+    _version_checked = False
+    _cached_ollama_version: Optional[str] = None
+
     def __init__(self, model: str = "llama3.1:8b", host: str = "localhost", port: int = 11434):
         """
         Initialize Llama integration
@@ -53,8 +377,22 @@ class LlamaIntegration:
         self.host = host
         self.port = port
         self.base_url = f"http://{host}:{port}"
-        self.command_history: List[CommandParsed] = []
-        self.learning_patterns: Dict[str, int] = {}
+        
+        # Keep-alive session shared by every Ollama request
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=MAX_CONCURRENT_QUERIES)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.command_history: Deque[CommandParsed] = deque(maxlen=COMMAND_HISTORY_SIZE)
+        self.learning_patterns: Counter = Counter()
+        # Normalized input -> (action, category, parameters, confidence)
+        self._parse_cache: "OrderedDict[str, Tuple[str, str, Dict, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        
+        # Response cache, persisted across runs
+        self.config_dir = Path.home() / ".config" / "linux-desktop-agent"
+        self.prompt_cache = PromptCache.for_path(self.config_dir / "prompt_cache.json")
+        self._embeddings_available = True
         
         # Verify Ollama is running
         if not self._check_ollama_running():
@@ -68,18 +406,17 @@ class LlamaIntegration:
     def _check_ollama_running(self) -> bool:
         """Check if Ollama service is running"""
         try:
-            result = subprocess.run(
-                ["curl", "-s", f"{self.base_url}/api/tags"],
-                capture_output=True,
-                timeout=2
-            )
-            return result.returncode == 0
-        except Exception as e:
-            logger.error(f"Error checking Ollama: {e}")
+            return self.session.get(f"{self.base_url}/api/tags", timeout=2).ok
+        except requests.RequestException:
             return False
 
     def _ensure_supported_version(self):
-        """Warn if Ollama version doesn't match supported version"""
+        """Warn if Ollama version doesn't match supported version (once per process)"""
+        with LlamaIntegration._version_lock:
+            if LlamaIntegration._version_checked:
+                return
+            LlamaIntegration._version_checked = True
+        
         installed_version = self._get_ollama_version()
         if not installed_version:
             logger.warning(
@@ -103,6 +440,9 @@ class LlamaIntegration:
 
     def _get_ollama_version(self) -> Optional[str]:
         """Return installed Ollama version (if available)"""
+        if LlamaIntegration._cached_ollama_version:
+            return LlamaIntegration._cached_ollama_version
+        
         try:
             result = subprocess.run(
                 ["ollama", "--version"],
@@ -114,9 +454,11 @@ class LlamaIntegration:
                 return None
 
             output = (result.stdout or result.stderr or "").strip()
-            match = re.search(r"(\d+\.\d+\.\d+)", output)
+            match = _VERSION_RE.search(output)
             if match:
-                return match.group(1)
+                version = match.group(1)
+                LlamaIntegration._cached_ollama_version = version
+                return version
         except FileNotFoundError:
             logger.warning("Ollama CLI not found in PATH.")
         except subprocess.SubprocessError as e:
@@ -125,51 +467,174 @@ class LlamaIntegration:
 
     @staticmethod
     def _compare_versions(current: str, expected: str) -> int:
-        """Compare semantic versions. Returns -1, 0, or 1."""
-        def normalize(version: str) -> Tuple[int, int, int]:
-            parts = version.split(".")
-            return tuple(int(part) for part in (parts + ["0", "0", "0"])[:3])
-        
-        current_parts = normalize(current)
-        expected_parts = normalize(expected)
-        if current_parts < expected_parts:
-            return -1
-        if current_parts > expected_parts:
-            return 1
-        return 0
+        """Compare versions (PEP 440 aware when packaging is installed). Returns -1, 0, or 1."""
+        if PACKAGING_AVAILABLE:
+            try:
+                current_version = Version(current)
+                expected_version = Version(expected)
+                return (current_version > expected_version) - (current_version < expected_version)
+            except InvalidVersion:
+                pass
+        
+        current_packed = _pack_version(current)
+        if expected == SUPPORTED_OLLAMA_VERSION:
+            expected_packed = _SUPPORTED_VERSION_PACKED
+        else:
+            expected_packed = _pack_version(expected)
+        return (current_packed > expected_packed) - (current_packed < expected_packed)
 
     def _initialize_system_prompt(self):
         """Initialize system prompt for command understanding"""
         self.system_prompt = """You are a Linux desktop AI agent. Respond only with valid JSON."""
 
-    def query_llama(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+    def _embed(self, text: str) -> Optional[List[float]]:
+        """Return an embedding for text, or None if embeddings are unavailable"""
+        if not self._embeddings_available:
+            return None
+        try:
+            response = self.session.post(
+                f"{self.base_url}/api/embeddings",
+                json={"model": EMBEDDING_MODEL, "prompt": text},
+                timeout=10
+            )
+            if response.status_code == 200:
+                embedding = response.json().get("embedding")
+                if embedding:
+                    return embedding
+            logger.debug(f"Embeddings unavailable: {response.status_code}")
+        except requests.RequestException as e:
+            logger.debug(f"Embeddings request failed: {e}")
+        # Don't keep paying for a failing round-trip on every miss
+        self._embeddings_available = False
+        return None
+
+    def query_llama(self, prompt: str, system_prompt: Optional[str] = None,
+                    semantic_key: Optional[str] = None, use_cache: bool = True,
+                    kind: str = "text") -> str:
         """
         Send query to Llama model via Ollama API
         
         Args:
             prompt: User prompt
             system_prompt: Optional system prompt override
+            semantic_key: Variable part of the prompt (usually the user's
+                input); enables near-duplicate matching against cached prompts
+                built from the same template. Only for free-text answers:
+                commands differing in one argument ("kill process 1234" and
+                "5678") embed as near-duplicates, so anything that returns
+                parameters must rely on exact matches alone
+            use_cache: Whether to serve and store cached responses
+            kind: Expected output shape - "json" (a single JSON object),
+                "token" (a single word) or "text" (free-form)
+            
+        Returns:
+            Model response
+        """
+        system_prompt = system_prompt or self.system_prompt
+        if not use_cache:
+            return self._generate(prompt, system_prompt, kind)
+        
+        key = PromptCache.make_key(self.model, system_prompt, prompt)
+        cached = self.prompt_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        scope = None
+        embedding = None
+        if semantic_key:
+            template = prompt.replace(semantic_key, "\0")
+            scope = PromptCache.make_key(self.model, system_prompt, template)
+            embedding = self._embed(semantic_key)
+            if embedding:
+                cached = self.prompt_cache.get_similar(scope, embedding)
+                if cached is not None:
+                    return cached
+        
+        response = self._generate(prompt, system_prompt, kind)
+        if response:
+            self.prompt_cache.put(key, response, scope, embedding)
+        return response
+
+    @staticmethod
+    def _opts(kind: str) -> Optional[Dict]:
+        """
+        Generation options for an output kind
+        
+        Structured outputs are generated greedily (deterministic, so repeats
+        hit the cache) with a tight token budget.
+        """
+        if kind == "json":
+            return {"temperature": 0.0, "top_k": 1, "num_predict": 256}
+        if kind == "token":
+            return {"temperature": 0.0, "top_k": 1, "num_predict": 8}
+        return None
+
+    def _generate(self, prompt: str, system_prompt: str, kind: str = "text") -> str:
+        """
+        Run a single streamed generation request against Ollama
+        
+        Args:
+            prompt: User prompt
+            system_prompt: System prompt
+            kind: Expected output shape; "json" stops reading once the first
+                JSON object is complete, "token" stops at the first newline
             
         Returns:
             Model response
         """
         try:
-            url = f"{self.base_url}/api/generate"
+            # The system prompt goes in its own chat message so consecutive
+            # calls share a token prefix Ollama can reuse from its KV cache
+            # instead of re-encoding it. Calls stay stateless: responses are
+            # never appended to the conversation.
+            url = f"{self.base_url}/api/chat"
             payload = {
                 "model": self.model,
-                "prompt": f"{system_prompt or self.system_prompt}\n\nUser: {prompt}",
-                "stream": False
+                "messages": [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt}
+                ],
+                "stream": True,
+                "keep_alive": OLLAMA_KEEP_ALIVE
             }
+            options = self._opts(kind)
+            if options:
+                payload["options"] = options
+            if kind == "json":
+                # Ollama's JSON mode constrains sampling to valid JSON
+                payload["format"] = "json"
+            stop_token = "\n" if kind == "token" else None
             
-            logger.debug(f"Querying Llama with prompt: {prompt[:50]}...")
-            response = requests.post(url, json=payload, timeout=120)
-            
-            if response.status_code == 200:
-                data = response.json()
-                return data.get("response", "").strip()
-            else:
-                logger.error(f"Ollama API error: {response.status_code} - {response.text[:200]}")
-                return ""
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Querying Llama with prompt: {prompt[:50]}...")
+            # Leaving the with-block closes the connection, which also makes
+            # Ollama stop generating tokens we no longer need.
+            with self.session.post(url, json=payload, timeout=120, stream=True) as response:
+                if response.status_code != 200:
+                    logger.error(f"Ollama API error: {response.status_code} - {response.text[:200]}")
+                    return ""
+                
+                parts = []
+                scanner = _JsonObjectScanner() if kind == "json" else None
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = _json_loads(line)
+                    text = chunk.get("message", {}).get("content", "")
+                    if text:
+                        parts.append(text)
+                        if scanner is not None:
+                            end = scanner.feed(text)
+                            if end >= 0:
+                                return "".join(parts)[:end].strip()
+                        elif stop_token and stop_token in text:
+                            output = "".join(parts).lstrip()
+                            if stop_token in output:
+                                return output.split(stop_token, 1)[0].strip()
+                    if chunk.get("done"):
+                        break
+                
+                return "".join(parts).strip()
         except requests.Timeout:
             logger.error("Llama query timeout (exceeded 120 seconds)")
             return ""
@@ -180,16 +645,24 @@ class LlamaIntegration:
             logger.error(f"Error querying Llama: {e}")
             return ""
 
-    def parse_command(self, user_input: str) -> CommandParsed:
+    def _parse_fields(self, user_input: str) -> Optional[Tuple[str, str, Dict, float]]:
         """
-        Parse user command using Llama
+        Run the combined action/category/parameters prompt for user_input
+        
+        Results are memoized per normalized input, so parse_command,
+        classify_command and extract_parameters share one LLM call.
         
-        Args:
-            user_input: Raw user input
-            
         Returns:
-            Parsed command with action, category, parameters
+            (action, category, parameters, confidence), or None if the model
+            response could not be parsed
         """
+        cache_key = user_input.strip().lower()
+        with self._lock:
+            cached = self._parse_cache.get(cache_key)
+            if cached is not None:
+                self._parse_cache.move_to_end(cache_key)
+                return cached
+        
         prompt = f"""Analyze this user command and extract the action, category, and parameters.
 Command: "{user_input}"
 
@@ -202,38 +675,43 @@ Respond ONLY with valid JSON (no markdown, no code blocks):
     "reasoning": "brief explanation"
 }}"""
         
-        response = self.query_llama(prompt)
+        response = self.query_llama(prompt, kind="json")
         
-        try:
-            # Extract JSON from response (handle markdown code blocks)
-            json_match = re.search(r'\{.*\}', response, re.DOTALL)
-            if json_match:
-                data = json.loads(json_match.group())
-            else:
-                data = json.loads(response)
-            
-            action = data.get("action") or "unknown"
-            category = data.get("category") or "help"
-            parameters = data.get("parameters") or {}
-
-            parsed = CommandParsed(
-                action=action,
-                category=category,
-                parameters=parameters,
-                confidence=float(data.get("confidence", 0.5)),
-                raw_input=user_input,
-                timestamp=datetime.now()
-            )
-            
-            # Learn from this command
-            self._learn_pattern(parsed)
-            self.command_history.append(parsed)
-            
-            return parsed
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse Llama response: {e}")
-            logger.debug(f"Response was: {response}")
+        data = _load_json_object(response)
+        if data is None:
+            logger.error("Failed to parse Llama response")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Response was: {response}")
+            return None
+        
+        fields = (
+            data.get("action") or "unknown",
+            data.get("category") or "help",
+            data.get("parameters") or {},
+            float(data.get("confidence", 0.5))
+        )
+        
+        # Remember the parse for identical future inputs
+        with self._lock:
+            self._parse_cache[cache_key] = fields
+            if len(self._parse_cache) > PARSE_CACHE_SIZE:
+                self._parse_cache.popitem(last=False)
+        
+        return fields
+
+    def parse_command(self, user_input: str) -> CommandParsed:
+        """
+        Parse user command using Llama
+        
+        Args:
+            user_input: Raw user input
             
+        Returns:
+            Parsed command with action, category, parameters
+        """
+        fields = self._parse_fields(user_input)
+        
+        if fields is None:
             # Fallback parsing
             return CommandParsed(
                 action="unknown",
@@ -243,22 +721,94 @@ Respond ONLY with valid JSON (no markdown, no code blocks):
                 raw_input=user_input,
                 timestamp=datetime.now()
             )
+        
+        action, category, parameters, confidence = fields
+        parsed = CommandParsed(
+            action=action,
+            category=category,
+            parameters=dict(parameters),
+            confidence=confidence,
+            raw_input=user_input,
+            timestamp=datetime.now()
+        )
+        
+        # Learn from this command
+        self._learn_pattern(parsed)
+        self.command_history.append(parsed)
+        
+        return parsed
+
+    async def aquery_llama(self, prompt: str, **kwargs) -> str:
+        """
+        Awaitable variant of query_llama
+        
+        Runs the blocking request in a worker thread so several queries can
+        overlap on the pooled keep-alive session.
+        """
+        return await asyncio.to_thread(self.query_llama, prompt, **kwargs)
+
+    async def aparse_command(self, user_input: str) -> CommandParsed:
+        """Awaitable variant of parse_command"""
+        return await asyncio.to_thread(self.parse_command, user_input)
+
+    def parse_commands(self, user_inputs: List[str]) -> List[CommandParsed]:
+        """
+        Parse several commands with overlapping LLM calls
+        
+        Args:
+            user_inputs: Raw user inputs
+            
+        Returns:
+            Parsed commands, in input order
+        """
+        async def parse_all():
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
+            
+            async def parse_one(user_input):
+                async with semaphore:
+                    return await self.aparse_command(user_input)
+            
+            return await asyncio.gather(*(parse_one(u) for u in user_inputs))
+        
+        return list(asyncio.run(parse_all()))
 
     def _learn_pattern(self, command: CommandParsed):
         """Learn from parsed commands to improve future predictions"""
         pattern_key = f"{command.category}:{command.action}"
-        self.learning_patterns[pattern_key] = self.learning_patterns.get(pattern_key, 0) + 1
+        with self._lock:
+            self.learning_patterns[pattern_key] += 1
 
     def classify_command(self, user_input: str) -> str:
         """
         Classify user command into a category
         
+        Reuses the combined parse of user_input when it yields a known
+        category, and only falls back to a category-only prompt otherwise.
+        
         Args:
             user_input: Raw user input
             
         Returns:
             Command category
         """
+        fields = self._parse_fields(user_input)
+        if fields is not None:
+            category = self._match_category(fields[1].lower())
+            if category:
+                return category
+        
+        return self._classify_only(user_input)
+
+    @staticmethod
+    def _match_category(text: str) -> Optional[str]:
+        """Return the first valid category mentioned in text"""
+        for category in VALID_CATEGORIES:
+            if category in text:
+                return category
+        return None
+
+    def _classify_only(self, user_input: str) -> str:
+        """Ask the model for just a category name"""
         prompt = f"""Classify this command into ONE category:
 Command: "{user_input}"
 
@@ -266,24 +816,18 @@ Categories: system_control, file_management, package_management, security, netwo
 
 Respond with ONLY the category name, nothing else."""
         
-        response = self.query_llama(prompt).strip().lower()
-        
-        valid_categories = [
-            "system_control", "file_management", "package_management",
-            "security", "network", "monitoring", "developer",
-            "automation", "cleanup", "help"
-        ]
+        response = self.query_llama(prompt, kind="token").strip().lower()
         
-        for category in valid_categories:
-            if category in response:
-                return category
-        
-        return "help"
+        return self._match_category(response) or "help"
 
     def extract_parameters(self, user_input: str, category: str) -> Dict[str, str]:
         """
         Extract parameters from user input for specific category
         
+        Reuses the combined parse of user_input when it put the command in
+        this category, so calling classify_command and extract_parameters
+        costs a single LLM call.
+        
         Args:
             user_input: Raw user input
             category: Command category
@@ -291,21 +835,19 @@ Respond with ONLY the category name, nothing else."""
         Returns:
             Dictionary of extracted parameters
         """
+        fields = self._parse_fields(user_input)
+        if fields is not None and fields[1] == category:
+            return dict(fields[2])
+        
         prompt = f"""Extract parameters from this {category} command:
 Command: "{user_input}"
 
 Return ONLY valid JSON with parameter names and values:
 {{"param1": "value1", "param2": "value2"}}"""
         
-        response = self.query_llama(prompt)
+        response = self.query_llama(prompt, kind="json")
         
-        try:
-            json_match = re.search(r'\{.*\}', response, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
-            return {}
-        except json.JSONDecodeError:
-            return {}
+        return _load_json_object(response) or {}
 
     def handle_unclear_command(self, user_input: str) -> Tuple[str, List[str]]:
         """
@@ -328,25 +870,23 @@ Respond in JSON:
     "suggestions": ["option1", "option2", "option3"]
 }}"""
         
-        response = self.query_llama(prompt)
+        # Exact matches only: suggestions are specific to the command
+        response = self.query_llama(prompt, kind="json")
         
-        try:
-            json_match = re.search(r'\{.*\}', response, re.DOTALL)
-            if json_match:
-                data = json.loads(json_match.group())
-                return data.get("question", "Could you clarify?"), data.get("suggestions", [])
-        except json.JSONDecodeError:
-            pass
+        data = _load_json_object(response)
+        if data is not None:
+            return data.get("question", "Could you clarify?"), data.get("suggestions", [])
         
         return "Could you clarify what you want to do?", []
 
     def get_command_history(self, limit: int = 10) -> List[CommandParsed]:
         """Get recent command history"""
-        return self.command_history[-limit:]
+        start = max(0, len(self.command_history) - limit)
+        return list(islice(self.command_history, start, None))
 
     def get_learning_stats(self) -> Dict[str, int]:
         """Get learning pattern statistics"""
-        return self.learning_patterns.copy()
+        return dict(self.learning_patterns)
 
     def suggest_next_action(self, context: str) -> str:
         """
@@ -380,7 +920,7 @@ Error: {error_message}
 
 Provide a brief, user-friendly explanation."""
         
-        return self.query_llama(prompt)
+        return self.query_llama(prompt, semantic_key=error_message)
 
 
 def test_llama_integration():
@@ -4,15 +4,28 @@ Module Framework for Desktop AI Agent
 Provides base classes and registry system for pluggable modules
 """
 
+import sys
+import json
+import time
 import logging
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional, Tuple
-from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# dataclass(slots=True) needs Python 3.10; older interpreters get plain classes
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 
 class ResultStatus(Enum):
     """Result status codes"""
@@ -22,7 +35,7 @@ class ResultStatus(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class ModuleResult:
     """Result from module execution"""
     status: ResultStatus
@@ -30,22 +43,34 @@ class ModuleResult:
     data: Dict[str, Any]
     error: Optional[str] = None
     execution_time: float = 0.0
-    timestamp: datetime = None
-    
-    def __post_init__(self):
-        if self.timestamp is None:
-            self.timestamp = datetime.now()
+    # Stamped on first serialization unless given; most results are never
+    # serialized, so constructing one doesn't read the clock
+    timestamp: Optional[datetime] = None
+    _timestamp_iso: Optional[str] = field(default=None, init=False, repr=False, compare=False)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert result to dictionary"""
+        if self._timestamp_iso is None:
+            if self.timestamp is None:
+                self.timestamp = datetime.now()
+            self._timestamp_iso = self.timestamp.isoformat()
         return {
             "status": self.status.value,
             "message": self.message,
             "data": self.data,
             "error": self.error,
             "execution_time": self.execution_time,
-            "timestamp": self.timestamp.isoformat()
+            "timestamp": self._timestamp_iso
         }
+    
+    def to_json(self) -> bytes:
+        """Serialize result to JSON in one call, using orjson when available"""
+        if ORJSON_AVAILABLE:
+            try:
+                return orjson.dumps(self.to_dict(), default=str)
+            except TypeError:
+                pass  # e.g. integers beyond 64 bits; let the stdlib handle it
+        return json.dumps(self.to_dict(), default=str).encode()
 
 
 class BaseModule(ABC):
@@ -54,6 +79,14 @@ class BaseModule(ABC):
     All modules must inherit from this class
     """
     
+    # Base state lives in slots; subclasses without their own __slots__
+    # still get a __dict__ for their extra attributes
+    __slots__ = (
+        "name", "description", "version", "enabled", "logger",
+        "execution_count", "total_execution_time", "last_execution",
+        "error_count", "_supported_actions_set"
+    )
+    
     def __init__(self, name: str, description: str, version: str = "1.0.0"):
         """
         Initialize base module
@@ -72,6 +105,7 @@ class BaseModule(ABC):
         self.total_execution_time = 0.0
         self.last_execution = None
         self.error_count = 0
+        self._supported_actions_set: Optional[frozenset] = None
     
     @abstractmethod
     def execute(self, action: str, parameters: Dict[str, Any]) -> ModuleResult:
@@ -97,6 +131,13 @@ class BaseModule(ABC):
         """
         pass
     
+    @property
+    def supported_actions(self) -> frozenset:
+        """Supported actions as a set, built once from get_supported_actions()"""
+        if self._supported_actions_set is None:
+            self._supported_actions_set = frozenset(self.get_supported_actions())
+        return self._supported_actions_set
+    
     def validate_parameters(self, parameters: Dict[str, Any], required: List[str]) -> Tuple[bool, str]:
         """
         Validate required parameters
@@ -117,15 +158,16 @@ class BaseModule(ABC):
         """Log module execution"""
         self.execution_count += 1
         self.total_execution_time += execution_time
-        self.last_execution = datetime.now()
+        self.last_execution = time.time()  # converted to a datetime in get_stats
         
-        if status == ResultStatus.FAILED:
+        if status is ResultStatus.FAILED:
             self.error_count += 1
         
-        self.logger.info(
-            f"Action '{action}' completed with status {status.value} "
-            f"in {execution_time:.2f}s"
-        )
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(
+                "Action '%s' completed with status %s in %.2fs",
+                action, status.value, execution_time
+            )
     
     def get_stats(self) -> Dict[str, Any]:
         """Get module statistics"""
@@ -140,7 +182,8 @@ class BaseModule(ABC):
             "error_count": self.error_count,
             "total_execution_time": self.total_execution_time,
             "average_execution_time": avg_time,
-            "last_execution": self.last_execution.isoformat() if self.last_execution else None
+            "last_execution": (datetime.fromtimestamp(self.last_execution).isoformat()
+                               if self.last_execution else None)
         }
     
     def info(self) -> Dict[str, Any]:
@@ -160,10 +203,26 @@ class ModuleRegistry:
     Handles module registration, lookup, and execution
     """
     
+    # Command category -> module name
+    _CATEGORY_MAP = MappingProxyType({
+        "system_control": "system_monitor",
+        "file_management": "file_manager",
+        "package_management": "package_manager",
+        "security": "security",
+        "network": "network",
+        "monitoring": "system_monitor",
+        "developer": "developer_tools",
+        "automation": "automation",
+        "cleanup": "system_cleanup"
+    })
+    
     def __init__(self):
         """Initialize module registry"""
         self.modules: Dict[str, BaseModule] = {}
+        self._modules_view = MappingProxyType(self.modules)
         self.logger = logging.getLogger("ModuleRegistry")
+        # Bumped on every register/unregister so callers can invalidate caches
+        self.generation = 0
     
     def register(self, module: BaseModule) -> bool:
         """
@@ -176,11 +235,12 @@ class ModuleRegistry:
             True if successful, False if module already exists
         """
         if module.name in self.modules:
-            self.logger.warning(f"Module '{module.name}' already registered")
+            self.logger.warning("Module '%s' already registered", module.name)
             return False
         
         self.modules[module.name] = module
-        self.logger.info(f"Registered module: {module.name}")
+        self.generation += 1
+        self.logger.info("Registered module: %s", module.name)
         return True
     
     def unregister(self, module_name: str) -> bool:
@@ -195,7 +255,8 @@ class ModuleRegistry:
         """
         if module_name in self.modules:
             del self.modules[module_name]
-            self.logger.info(f"Unregistered module: {module_name}")
+            self.generation += 1
+            self.logger.info("Unregistered module: %s", module_name)
             return True
         return False
     
@@ -211,9 +272,13 @@ class ModuleRegistry:
         """
         return self.modules.get(module_name)
     
-    def get_all_modules(self) -> Dict[str, BaseModule]:
-        """Get all registered modules"""
-        return self.modules.copy()
+    def get_all_modules(self) -> Mapping[str, BaseModule]:
+        """
+        Get all registered modules
+        
+        Returns a live read-only view; use register/unregister to change it.
+        """
+        return self._modules_view
     
     def execute(self, module_name: str, action: str, 
                 parameters: Dict[str, Any]) -> ModuleResult:
@@ -246,7 +311,7 @@ class ModuleRegistry:
                 error="Module disabled"
             )
         
-        if action not in module.get_supported_actions():
+        if action not in module.supported_actions:
             return ModuleResult(
                 status=ResultStatus.FAILED,
                 message=f"Action '{action}' not supported by module '{module_name}'",
@@ -255,7 +320,6 @@ class ModuleRegistry:
             )
         
         try:
-            import time
             start_time = time.time()
             result = module.execute(action, parameters)
             execution_time = time.time() - start_time
@@ -265,7 +329,7 @@ class ModuleRegistry:
             
             return result
         except Exception as e:
-            self.logger.error(f"Error executing {module_name}.{action}: {e}")
+            self.logger.error("Error executing %s.%s: %s", module_name, action, e)
             return ModuleResult(
                 status=ResultStatus.FAILED,
                 message=f"Error executing action: {str(e)}",
@@ -283,19 +347,7 @@ class ModuleRegistry:
         Returns:
             Module instance or None
         """
-        category_map = {
-            "system_control": "system_monitor",
-            "file_management": "file_manager",
-            "package_management": "package_manager",
-            "security": "security",
-            "network": "network",
-            "monitoring": "system_monitor",
-            "developer": "developer_tools",
-            "automation": "automation",
-            "cleanup": "system_cleanup"
-        }
-        
-        module_name = category_map.get(category)
+        module_name = self._CATEGORY_MAP.get(category)
         return self.get_module(module_name) if module_name else None
     
     def list_modules(self) -> List[Dict[str, Any]]:
@@ -314,7 +366,7 @@ class ModuleRegistry:
         module = self.get_module(module_name)
         if module:
             module.enabled = True
-            self.logger.info(f"Enabled module: {module_name}")
+            self.logger.info("Enabled module: %s", module_name)
             return True
         return False
     
@@ -323,7 +375,7 @@ class ModuleRegistry:
         module = self.get_module(module_name)
         if module:
             module.enabled = False
-            self.logger.info(f"Disabled module: {module_name}")
+            self.logger.info("Disabled module: %s", module_name)
             return True
         return False
 
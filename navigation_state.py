@@ -1,16 +1,48 @@
 import os
 import json
+import time
+import atexit
+import functools
+import threading
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Seconds to wait after a navigation before writing state, so bursts of
+# navigation are written once
+SAVE_DEBOUNCE = 0.25
 
 class FileSystemNavigator:
     def __init__(self):
-        self.current_path = os.path.expanduser("~")  # Start at home
+        self._home = os.path.expanduser("~")
+        self.current_path = self._home  # Start at home
         self.path_history = []
         self.state_file = os.path.join(os.path.dirname(__file__), "nav_state.json")
+        self._state_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._save_event = threading.Event()
+        self._saver = None
         self.load_state()
+        self.refresh_main_folders()
     
     def get_main_folders(self):
-        """Return main system locations"""
-        home = os.path.expanduser("~")
+        """Return main system locations (cached; see refresh_main_folders)"""
+        return self._main_folders
+    
+    def refresh_main_folders(self):
+        """Rebuild the main locations, e.g. after drives were added on Windows"""
+        self._main_folders = self._build_main_folders()
+        # Reverse map for friendly names; the first name listed for a path wins
+        self._path_to_name = {}
+        for name, path in self._main_folders.items():
+            self._path_to_name.setdefault(path, name.title())
+    
+    def _build_main_folders(self):
+        """Compute main system locations"""
+        home = self._home
         main_folders = {
             "home": home,
             "desktop": os.path.join(home, "Desktop"),
@@ -25,20 +57,23 @@ class FileSystemNavigator:
         if os.name != 'nt':
             main_folders["root"] = "/"
         else:
-            # Add available drives on Windows
-            import string
-            for letter in string.ascii_uppercase:
-                drive = f"{letter}:\\"
-                if os.path.exists(drive):
-                    main_folders[f"drive_{letter}"] = drive
+            # Add available drives on Windows; GetLogicalDrives reports every
+            # present drive as one bitmask (bit 0 = A:) in a single call
+            import ctypes
+            mask = ctypes.windll.kernel32.GetLogicalDrives()
+            for i in range(26):
+                if mask & (1 << i):
+                    letter = chr(ord("A") + i)
+                    main_folders[f"drive_{letter}"] = f"{letter}:\\"
         
         return main_folders
     
     def navigate_to(self, path):
         """Navigate to a specific path"""
-        if path in self.get_main_folders():
+        main_folders = self.get_main_folders()
+        if path in main_folders:
             # Navigate to main folder
-            new_path = self.get_main_folders()[path]
+            new_path = main_folders[path]
         elif os.path.isabs(path):
             # Absolute path
             new_path = path
@@ -47,8 +82,9 @@ class FileSystemNavigator:
             new_path = os.path.join(self.current_path, path)
         
         if os.path.exists(new_path) and os.path.isdir(new_path):
-            self.path_history.append(self.current_path)
-            self.current_path = new_path
+            with self._state_lock:
+                self.path_history.append(self.current_path)
+                self.current_path = new_path
             self.save_state()
             return True, f"Navigated to {new_path}"
         else:
@@ -57,7 +93,8 @@ class FileSystemNavigator:
     def go_back(self):
         """Go back to previous directory"""
         if self.path_history:
-            self.current_path = self.path_history.pop()
+            with self._state_lock:
+                self.current_path = self.path_history.pop()
             self.save_state()
             return True, f"Went back to {self.current_path}"
         else:
@@ -69,21 +106,50 @@ class FileSystemNavigator:
     
     def get_current_path_name(self):
         """Get friendly name of current path"""
-        main_folders = self.get_main_folders()
-        for name, path in main_folders.items():
-            if self.current_path == path:
-                return name.title()
-        return os.path.basename(self.current_path) or self.current_path
+        return (self._path_to_name.get(self.current_path)
+                or os.path.basename(self.current_path)
+                or self.current_path)
     
     def save_state(self):
-        """Save navigation state to file"""
-        try:
+        """Schedule a save of the navigation state on the background writer"""
+        if self._saver is None:
+            self._saver = threading.Thread(target=self._save_loop, daemon=True)
+            self._saver.start()
+            atexit.register(self.flush_state)
+        self._save_event.set()
+    
+    def flush_state(self):
+        """Write any pending navigation state now"""
+        if self._save_event.is_set():
+            self._save_event.clear()
+            self._write_state()
+    
+    def _save_loop(self):
+        """Background writer: coalesce save requests and write the latest state"""
+        while True:
+            self._save_event.wait()
+            time.sleep(SAVE_DEBOUNCE)
+            self.flush_state()
+    
+    def _write_state(self):
+        """Write navigation state to file"""
+        with self._state_lock:
             state = {
                 "current_path": self.current_path,
-                "path_history": self.path_history
+                "path_history": list(self.path_history)
             }
-            with open(self.state_file, 'w') as f:
-                json.dump(state, f)
+        try:
+            if ORJSON_AVAILABLE:
+                data = orjson.dumps(state)
+            else:
+                data = json.dumps(state).encode()
+            # Write a sibling file and swap it in, so readers never see a
+            # partially written state file
+            tmp_file = self.state_file + ".tmp"
+            with self._write_lock:
+                with open(tmp_file, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_file, self.state_file)
         except:
             pass  # Ignore save errors
     
@@ -91,12 +157,21 @@ class FileSystemNavigator:
         """Load navigation state from file"""
         try:
             if os.path.exists(self.state_file):
-                with open(self.state_file, 'r') as f:
-                    state = json.load(f)
-                    self.current_path = state.get("current_path", os.path.expanduser("~"))
-                    self.path_history = state.get("path_history", [])
+                with open(self.state_file, 'rb') as f:
+                    data = f.read()
+                state = orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+                self.current_path = state.get("current_path", self._home)
+                self.path_history = state.get("path_history", [])
         except:
             pass  # Ignore load errors
 
-# Global navigator instance
-navigator = FileSystemNavigator()
+@functools.lru_cache(maxsize=1)
+def get_navigator():
+    """Return the shared navigator, creating (and loading its state) on first use"""
+    return FileSystemNavigator()
+
+def __getattr__(name):
+    # Keep `navigation_state.navigator` working without building it at import
+    if name == "navigator":
+        return get_navigator()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
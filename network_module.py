@@ -4,14 +4,108 @@ Network Module for Desktop AI Agent
 Handles network diagnostics and connectivity
 """
 
+import re
+import asyncio
 import subprocess
 import socket
 import logging
-from typing import Dict, Any, List
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
 from module_framework import BaseModule, ModuleResult, ResultStatus
 
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+try:
+    from pyroute2 import IPRoute
+    PYROUTE2_AVAILABLE = True
+except ImportError:
+    PYROUTE2_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Round-trip summary printed by ping (Linux "mdev", BSD/macOS "stddev")
+_PING_RTT_RE = re.compile(
+    r"min/avg/max/(?:mdev|stddev)\s*=\s*([\d.]+)/([\d.]+)/([\d.]+)/([\d.]+)"
+)
+
+INTERFACE_CACHE_TTL = 2.0  # seconds
+WIRELESS_PROC = "/proc/net/wireless"
+DNS_CACHE_TTL = 60.0  # seconds
+DNS_CACHE_SIZE = 256
+
+# hostname -> (resolved_at, ip)
+_dns_cache: Dict[str, Tuple[float, str]] = {}
+
+
+def _resolve(host: str, ttl: float = DNS_CACHE_TTL) -> str:
+    """
+    Resolve host to an IPv4 address, reusing answers for `ttl` seconds
+    
+    Failures are not cached, so a broken resolver is retried on each call.
+    """
+    now = time.monotonic()
+    hit = _dns_cache.get(host)
+    if hit and now - hit[0] < ttl:
+        return hit[1]
+    ip = socket.gethostbyname(host)
+    _dns_cache.pop(host, None)
+    if len(_dns_cache) >= DNS_CACHE_SIZE:
+        _dns_cache.pop(next(iter(_dns_cache)))  # evict the oldest entry
+    _dns_cache[host] = (now, ip)
+    return ip
+
+
+async def _run_async(cmd: List[str], timeout: float,
+                     tail: Optional[int] = None) -> Tuple[int, str, str]:
+    """
+    Run a command as an asyncio subprocess
+    
+    Args:
+        cmd: Command and arguments
+        timeout: Seconds before the process is killed
+        tail: If set, keep only the last `tail` lines of stdout, reading it
+            line by line instead of buffering all of it
+    
+    Returns:
+        (returncode, stdout, stderr)
+    
+    Raises:
+        subprocess.TimeoutExpired: after killing the process on timeout
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    
+    async def read_tail():
+        lines = deque(maxlen=tail)
+        async for line in proc.stdout:
+            lines.append(line)
+        return b"".join(lines)
+    
+    async def communicate():
+        if tail is None:
+            return await proc.communicate()
+        stdout, stderr = await asyncio.gather(read_tail(), proc.stderr.read())
+        await proc.wait()
+        return stdout, stderr
+    
+    try:
+        stdout, stderr = await asyncio.wait_for(communicate(), timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    return proc.returncode, stdout.decode(errors="replace"), stderr.decode(errors="replace")
+
 
 class NetworkModule(BaseModule):
     """
@@ -25,6 +119,21 @@ class NetworkModule(BaseModule):
             description="Network diagnostics and management",
             version="1.0.0"
         )
+        # (expires_at, interface descriptions)
+        self._interfaces_cache = None
+        # action -> handler(parameters)
+        self._dispatch = {
+            "test_connectivity": lambda parameters: self._test_connectivity(),
+            "speed_test": lambda parameters: self._speed_test(),
+            "ping_server": self._ping_server,
+            "check_dns": lambda parameters: self._check_dns(),
+            "test_wifi_signal": lambda parameters: self._test_wifi_signal(),
+            "get_network_interfaces": lambda parameters: self._get_network_interfaces(),
+            "diagnose_connection": lambda parameters: self._diagnose_connection(),
+            "switch_dns": self._switch_dns,
+            "get_gateway": lambda parameters: self._get_gateway(),
+            "test_port": self._test_port
+        }
     
     def get_supported_actions(self) -> List[str]:
         """Get supported network actions"""
@@ -44,32 +153,14 @@ class NetworkModule(BaseModule):
     def execute(self, action: str, parameters: Dict[str, Any]) -> ModuleResult:
         """Execute network action"""
         try:
-            if action == "test_connectivity":
-                return self._test_connectivity()
-            elif action == "speed_test":
-                return self._speed_test()
-            elif action == "ping_server":
-                return self._ping_server(parameters)
-            elif action == "check_dns":
-                return self._check_dns()
-            elif action == "test_wifi_signal":
-                return self._test_wifi_signal()
-            elif action == "get_network_interfaces":
-                return self._get_network_interfaces()
-            elif action == "diagnose_connection":
-                return self._diagnose_connection()
-            elif action == "switch_dns":
-                return self._switch_dns(parameters)
-            elif action == "get_gateway":
-                return self._get_gateway()
-            elif action == "test_port":
-                return self._test_port(parameters)
-            else:
+            handler = self._dispatch.get(action)
+            if handler is None:
                 return ModuleResult(
                     status=ResultStatus.FAILED,
                     message=f"Unknown action: {action}",
                     data={}
                 )
+            return handler(parameters)
         except Exception as e:
             return ModuleResult(
                 status=ResultStatus.FAILED,
@@ -86,16 +177,12 @@ class NetworkModule(BaseModule):
             ("208.67.222.222", "OpenDNS")
         ]
         
-        results = {}
-        connected = False
+        # Probe all servers at once; wall time is the slowest probe, not the sum
+        with ThreadPoolExecutor(max_workers=len(servers)) as executor:
+            reachable = list(executor.map(lambda s: self._probe(s[0], 53), servers))
         
-        for server, name in servers:
-            try:
-                socket.create_connection((server, 53), timeout=2)
-                results[name] = True
-                connected = True
-            except (socket.timeout, socket.error):
-                results[name] = False
+        results = {name: ok for (server, name), ok in zip(servers, reachable)}
+        connected = any(reachable)
         
         status = ResultStatus.SUCCESS if connected else ResultStatus.FAILED
         message = "Internet connected" if connected else "No internet connection"
@@ -106,78 +193,115 @@ class NetworkModule(BaseModule):
             data={"servers": results, "connected": connected}
         )
     
+    @staticmethod
+    def _probe(host: str, port: int, timeout: float = 2) -> bool:
+        """Return True if a TCP connection to host:port succeeds"""
+        try:
+            with socket.create_connection((host, port), timeout=timeout):
+                return True
+        except (socket.timeout, socket.error):
+            return False
+    
     def _speed_test(self) -> ModuleResult:
         """Run speed test (requires speedtest-cli)"""
         try:
-            result = subprocess.run(
+            proc = subprocess.Popen(
                 ["speedtest-cli", "--simple"],
-                capture_output=True,
-                text=True,
-                timeout=120
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True
             )
-            
-            if result.returncode == 0:
-                lines = result.stdout.strip().split("\n")
-                if len(lines) >= 2:
-                    download = float(lines[0])
-                    upload = float(lines[1])
-                    
-                    data = {
-                        "download_mbps": download,
-                        "upload_mbps": upload
-                    }
-                    
-                    return ModuleResult(
-                        status=ResultStatus.SUCCESS,
-                        message=f"Download: {download:.2f} Mbps, Upload: {upload:.2f} Mbps",
-                        data=data
-                    )
-            
+        except FileNotFoundError:
             return ModuleResult(
                 status=ResultStatus.FAILED,
-                message="Speed test failed",
+                message="speedtest-cli not installed",
                 data={},
-                error=result.stderr
+                error="Install with: pip install speedtest-cli"
             )
-        except FileNotFoundError:
+        
+        # Parse the output as it is printed ("Download: 93.10 Mbit/s") and
+        # stop as soon as both rates are known
+        killer = threading.Timer(120, proc.kill)
+        killer.start()
+        rates = {}
+        try:
+            for line in proc.stdout:
+                label, _, value = line.partition(":")
+                label = label.strip().lower()
+                if label in ("download", "upload"):
+                    rates[label] = float(value.split()[0])
+                    if len(rates) == 2:
+                        break
+            
+            if len(rates) == 2:
+                proc.terminate()
+                download, upload = rates["download"], rates["upload"]
+                data = {
+                    "download_mbps": download,
+                    "upload_mbps": upload
+                }
+                
+                return ModuleResult(
+                    status=ResultStatus.SUCCESS,
+                    message=f"Download: {download:.2f} Mbps, Upload: {upload:.2f} Mbps",
+                    data=data
+                )
+            
+            proc.wait()
             return ModuleResult(
                 status=ResultStatus.FAILED,
-                message="speedtest-cli not installed",
+                message="Speed test failed",
                 data={},
-                error="Install with: pip install speedtest-cli"
+                error=proc.stderr.read()
             )
         except Exception as e:
+            proc.kill()
             return ModuleResult(
                 status=ResultStatus.FAILED,
                 message="Speed test error",
                 data={},
                 error=str(e)
             )
+        finally:
+            killer.cancel()
+            proc.wait()
+            proc.stdout.close()
+            proc.stderr.close()
     
     def _ping_server(self, parameters: Dict[str, Any]) -> ModuleResult:
         """Ping a server"""
+        return asyncio.run(self._ping_server_async(parameters))
+    
+    async def _ping_server_async(self, parameters: Dict[str, Any]) -> ModuleResult:
+        """Ping a server without blocking the event loop"""
         server = parameters.get("server", "8.8.8.8")
         count = parameters.get("count", 4)
         
         try:
-            result = subprocess.run(
+            # Only the summary (packet statistics and rtt lines) is kept;
+            # per-reply lines are discarded as they stream in
+            returncode, stdout, stderr = await _run_async(
                 ["ping", "-c", str(count), server],
-                capture_output=True,
-                text=True,
-                timeout=30
+                timeout=30,
+                tail=2
             )
             
-            if result.returncode == 0:
-                # Parse ping output
-                lines = result.stdout.strip().split("\n")
-                stats_line = lines[-1]
-                
+            if returncode == 0:
                 data = {
                     "server": server,
                     "packets_sent": count,
-                    "output": result.stdout
+                    "output": stdout
                 }
                 
+                match = _PING_RTT_RE.search(stdout)
+                if match:
+                    data["rtt_ms"] = {
+                        "min": float(match[1]),
+                        "avg": float(match[2]),
+                        "max": float(match[3]),
+                        "mdev": float(match[4])
+                    }
+                
                 return ModuleResult(
                     status=ResultStatus.SUCCESS,
                     message=f"Ping to {server} successful",
@@ -188,7 +312,7 @@ class NetworkModule(BaseModule):
                     status=ResultStatus.FAILED,
                     message=f"Ping to {server} failed",
                     data={"server": server},
-                    error=result.stderr
+                    error=stderr
                 )
         except Exception as e:
             return ModuleResult(
@@ -206,16 +330,16 @@ class NetworkModule(BaseModule):
             "ubuntu.com"
         ]
         
-        results = {}
-        all_working = True
-        
-        for domain in test_domains:
+        def lookup(domain):
             try:
-                ip = socket.gethostbyname(domain)
-                results[domain] = ip
+                return _resolve(domain)
             except socket.gaierror:
-                results[domain] = "Failed"
-                all_working = False
+                return "Failed"
+        
+        # Resolve all domains at once so a slow resolver is waited on only once
+        with ThreadPoolExecutor(max_workers=len(test_domains)) as executor:
+            results = dict(zip(test_domains, executor.map(lookup, test_domains)))
+        all_working = "Failed" not in results.values()
         
         status = ResultStatus.SUCCESS if all_working else ResultStatus.PARTIAL
         
@@ -227,6 +351,30 @@ class NetworkModule(BaseModule):
     
     def _test_wifi_signal(self) -> ModuleResult:
         """Test WiFi signal strength"""
+        # The kernel publishes per-interface link quality and signal level in
+        # /proc/net/wireless; read it directly before falling back to iwconfig
+        try:
+            with open(WIRELESS_PROC) as f:
+                output = f.read()
+        except OSError:
+            output = ""
+        
+        interfaces = []
+        for line in output.splitlines()[2:]:  # two header lines
+            name, _, values = line.partition(":")
+            fields = values.split()
+            if len(fields) >= 3:
+                interfaces.append(
+                    f"{name.strip()}: Link Quality={fields[1].rstrip('.')} "
+                    f"Signal level={fields[2].rstrip('.')} dBm"
+                )
+        if interfaces:
+            return ModuleResult(
+                status=ResultStatus.SUCCESS,
+                message="WiFi signal info retrieved",
+                data={"output": output, "interfaces": interfaces}
+            )
+        
         try:
             result = subprocess.run(
                 ["iwconfig"],
@@ -277,7 +425,45 @@ class NetworkModule(BaseModule):
             )
     
     def _get_network_interfaces(self) -> ModuleResult:
-        """Get network interfaces"""
+        """Get network interfaces (briefly cached)"""
+        if not PSUTIL_AVAILABLE:
+            return self._get_network_interfaces_ip()
+        
+        now = time.monotonic()
+        if self._interfaces_cache and self._interfaces_cache[0] > now:
+            interfaces = list(self._interfaces_cache[1])
+        else:
+            try:
+                interfaces = self._read_interfaces()
+            except Exception as e:
+                logger.debug("psutil interface query failed, using ip: %s", e)
+                return self._get_network_interfaces_ip()
+            self._interfaces_cache = (now + INTERFACE_CACHE_TTL, interfaces)
+            interfaces = list(interfaces)
+        
+        return ModuleResult(
+            status=ResultStatus.SUCCESS,
+            message="Network interfaces retrieved",
+            data={"interfaces": interfaces}
+        )
+    
+    @staticmethod
+    def _read_interfaces() -> List[str]:
+        """Describe each interface in-process from psutil"""
+        addrs = psutil.net_if_addrs()
+        stats = psutil.net_if_stats()
+        interfaces = []
+        for name, stat in stats.items():
+            line = f"{name}: state {'UP' if stat.isup else 'DOWN'} mtu {stat.mtu}"
+            inet = [a.address for a in addrs.get(name, ())
+                    if a.family in (socket.AF_INET, socket.AF_INET6)]
+            if inet:
+                line += " inet " + " ".join(inet)
+            interfaces.append(line)
+        return interfaces
+    
+    def _get_network_interfaces_ip(self) -> ModuleResult:
+        """Get network interfaces by parsing `ip link show`"""
         try:
             result = subprocess.run(
                 ["ip", "link", "show"],
@@ -314,23 +500,26 @@ class NetworkModule(BaseModule):
     
     def _diagnose_connection(self) -> ModuleResult:
         """Full connection diagnosis"""
-        diagnostics = {}
-        
-        # Test connectivity
-        connectivity = self._test_connectivity()
-        diagnostics["connectivity"] = connectivity.to_dict()
-        
-        # Check DNS
-        dns = self._check_dns()
-        diagnostics["dns"] = dns.to_dict()
-        
-        # Get interfaces
-        interfaces = self._get_network_interfaces()
-        diagnostics["interfaces"] = interfaces.to_dict()
+        return asyncio.run(self._diagnose_connection_async())
+    
+    async def _diagnose_connection_async(self) -> ModuleResult:
+        """Full connection diagnosis, awaiting all checks together"""
+        # The checks are independent I/O, so run them side by side; the
+        # diagnosis takes as long as the slowest one (usually the ping).
+        # Socket and resolver checks use blocking APIs and get a thread each.
+        connectivity, dns, interfaces, ping = await asyncio.gather(
+            asyncio.to_thread(self._test_connectivity),
+            asyncio.to_thread(self._check_dns),
+            asyncio.to_thread(self._get_network_interfaces),
+            self._ping_server_async({"server": "8.8.8.8"})
+        )
         
-        # Ping common server
-        ping = self._ping_server({"server": "8.8.8.8"})
-        diagnostics["ping"] = ping.to_dict()
+        diagnostics = {
+            "connectivity": connectivity.to_dict(),
+            "dns": dns.to_dict(),
+            "interfaces": interfaces.to_dict(),
+            "ping": ping.to_dict()
+        }
         
         status = ResultStatus.SUCCESS
         if not connectivity.data.get("connected"):
@@ -380,6 +569,12 @@ class NetworkModule(BaseModule):
     
     def _get_gateway(self) -> ModuleResult:
         """Get default gateway"""
+        if PYROUTE2_AVAILABLE:
+            try:
+                return self._get_gateway_netlink()
+            except Exception as e:
+                logger.debug("netlink route query failed, using ip: %s", e)
+        
         try:
             result = subprocess.run(
                 ["ip", "route", "show"],
@@ -421,6 +616,39 @@ class NetworkModule(BaseModule):
                 error=str(e)
             )
     
+    def _get_gateway_netlink(self) -> ModuleResult:
+        """Get default gateway over netlink, without spawning `ip`"""
+        with IPRoute() as ipr:
+            names = {link["index"]: link.get_attr("IFLA_IFNAME") for link in ipr.get_links()}
+            routes = ipr.get_routes(family=socket.AF_INET, table=254)  # main table, as `ip route show`
+        
+        gateway = None
+        lines = []
+        for route in routes:
+            dst = route.get_attr("RTA_DST")
+            via = route.get_attr("RTA_GATEWAY")
+            dev = names.get(route.get_attr("RTA_OIF"), "?")
+            if dst is None:
+                line = "default"
+                if gateway is None and via:
+                    gateway = via
+            else:
+                line = f"{dst}/{route['dst_len']}"
+            if via:
+                line += f" via {via}"
+            lines.append(f"{line} dev {dev}")
+        
+        data = {
+            "gateway": gateway,
+            "routes": "\n".join(lines)
+        }
+        
+        return ModuleResult(
+            status=ResultStatus.SUCCESS,
+            message=f"Gateway: {gateway}",
+            data=data
+        )
+    
     def _test_port(self, parameters: Dict[str, Any]) -> ModuleResult:
         """Test if a port is open"""
         host = parameters.get("host", "localhost")
@@ -433,19 +661,17 @@ class NetworkModule(BaseModule):
                 data={}
             )
         
-        try:
-            socket.create_connection((host, int(port)), timeout=2)
+        if self._probe(host, int(port)):
             return ModuleResult(
                 status=ResultStatus.SUCCESS,
                 message=f"Port {port} on {host} is open",
                 data={"host": host, "port": port, "open": True}
             )
-        except (socket.timeout, socket.error):
-            return ModuleResult(
-                status=ResultStatus.FAILED,
-                message=f"Port {port} on {host} is closed",
-                data={"host": host, "port": port, "open": False}
-            )
+        return ModuleResult(
+            status=ResultStatus.FAILED,
+            message=f"Port {port} on {host} is closed",
+            data={"host": host, "port": port, "open": False}
+        )
 
 
 if __name__ == "__main__":
@@ -1,16 +1,25 @@
-from fuzzywuzzy import fuzz
-from fuzzywuzzy import process
 import re
+import functools
+import itertools
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
 
-# Import new modules
+# RapidFuzz is a drop-in, compiled replacement for fuzzywuzzy; keep the
+# latter as a fallback for installs that still only have it
 try:
-    from app_launcher import *
-    from advanced_file_ops import *
-    from security_cleanup import *
-    from personalization import *
-    from email_automation import *
-except ImportError as e:
-    print(f"Warning: Could not import some modules: {e}")
+    from rapidfuzz import fuzz, process, utils
+    from rapidfuzz.distance import Indel, Levenshtein
+    RAPIDFUZZ_AVAILABLE = True
+    # fuzzywuzzy's default processing: lowercased, non-alphanumerics to spaces
+    _PROCESSOR = utils.default_process
+except ImportError:
+    from fuzzywuzzy import fuzz
+    from fuzzywuzzy import process
+    from fuzzywuzzy import utils
+    RAPIDFUZZ_AVAILABLE = False
+    _PROCESSOR = utils.full_process
+
+# (command, param1, param2) as returned by parse_command
+ParseResult = Tuple[Optional[str], Any, Any]
 
 # Define action words and their synonyms
 ACTION_WORDS = {
@@ -79,243 +88,405 @@ PERSONAL_WORDS = ["shortcut", "workflow", "habit", "pattern", "preference", "fav
 # Email target words
 EMAIL_WORDS = ["email", "mail", "message", "template", "attachment"]
 
-def preprocess_natural_language(user_input):
+def _build_synonym_table() -> Dict[str, str]:
+    """Map every action synonym to its action
+
+    A synonym listed under several actions belongs to the first one.
+    """
+    table = {}
+    for action, synonyms in ACTION_WORDS.items():
+        for synonym in synonyms:
+            table.setdefault(synonym, action)
+    return table
+
+_SYNONYM_TO_ACTION = _build_synonym_table()
+# Flattened in ACTION_WORDS order, so score ties go to the earlier action
+_ALL_SYNONYMS = list(_SYNONYM_TO_ACTION)
+
+# Destructive actions ai_operator carries out as soon as they're parsed. A
+# typo-tolerant match must never select them ("result" is close enough to
+# "restart", "deleted" to "delete"), so only their verbs do, as typed or
+# with -ing ("rebooting the system")
+_EXACT_ONLY_ACTIONS = ("delete", "shutdown", "restart")
+_EXACT_ONLY_WORDS = {
+    synonym + ending: action
+    for action in _EXACT_ONLY_ACTIONS
+    for synonym in ACTION_WORDS[action]
+    for ending in ("", "ing")
+}
+_FUZZY_SYNONYMS = [synonym for synonym, action in _SYNONYM_TO_ACTION.items()
+                   if action not in _EXACT_ONLY_ACTIONS]
+# Two-word spelling of the poweroff verb
+_POWER_OFF_RE = re.compile(r"\bpower off\b")
+
+# Conversational filler stripped before matching
+CONVERSATIONAL_STARTERS = [
+    "hey", "hi", "hello", "can you", "could you", "would you", "please",
+    "i want to", "i need to", "i would like to", "help me", "make me",
+    "do this", "can it", "is it possible", "how do i", "how can i"
+]
+
+# Natural phrasings rewritten to the action word they mean
+QUESTION_PATTERNS = [
+    ("can you make me a", "create"),
+    ("make me a", "create"),
+    ("create me a", "create"),
+    ("i want to create", "create"),
+    ("i need to make", "create"),
+    ("help me create", "create"),
+    ("help me make", "create"),
+    ("can you open", "open"),
+    ("open up", "open"),
+    ("i want to open", "open"),
+    ("launch", "open"),
+    ("start", "open"),
+    ("run", "open"),
+    ("show me", "list"),
+    ("display", "list"),
+    ("let me see", "list"),
+    ("i want to see", "list"),
+    ("what are my", "list"),
+    ("list my", "list"),
+    ("find me", "search"),
+    ("look for", "search"),
+    ("search for", "search"),
+    ("can you find", "search"),
+    ("where is", "search"),
+    ("locate", "search"),
+    ("delete this", "delete"),
+    ("remove this", "delete"),
+    ("get rid of", "delete"),
+    ("clean up", "clean"),
+    ("tidy up", "organize"),
+    ("sort out", "organize"),
+    ("organize my", "organize"),
+    ("fix my", "optimize"),
+    ("speed up", "optimize"),
+    ("make faster", "optimize"),
+    ("improve", "optimize"),
+    ("secure my", "scan"),
+    ("protect my", "scan"),
+    ("check for viruses", "scan"),
+    ("scan my", "scan"),
+    ("backup my", "backup"),
+    ("save my", "backup"),
+    ("copy my", "backup"),
+    ("compress", "compress"),
+    ("zip", "compress"),
+    ("archive", "compress"),
+    ("extract", "extract"),
+    ("unzip", "extract"),
+    ("what can you do", "capabilities"),
+    ("what do you do", "capabilities"),
+    ("help", "capabilities"),
+    ("features", "capabilities")
+]
+
+# Questions about what the assistant can do
+CAPABILITY_QUESTIONS = [
+    "what can you do", "what are your features", "what do you do",
+    "help me", "what's possible", "show capabilities", "list features"
+]
+
+def _alternation(phrases: Iterable[str]) -> str:
+    return "|".join(re.escape(phrase) for phrase in phrases)
+
+# Each table is applied with one compiled regex, so the text is scanned once
+# per table rather than once or twice per phrase
+_LEADING_STARTERS_RE = re.compile(r"^(?:(?:%s)\b\s*)+" % _alternation(CONVERSATIONAL_STARTERS))
+_INNER_STARTERS_RE = re.compile(r" (?:%s)(?= )" % _alternation(CONVERSATIONAL_STARTERS))
+_QUESTION_PATTERNS_RE = re.compile(r"\b(?:%s)\b" % _alternation(p for p, _ in QUESTION_PATTERNS))
+_QUESTION_REPLACEMENTS = dict(QUESTION_PATTERNS)
+_CAPABILITY_QUESTIONS_RE = re.compile(_alternation(CAPABILITY_QUESTIONS))
+
+class _KeywordScanner:
+    """Find which keywords of a vocabulary occur inside a text in one pass"""
+    
+    def __init__(self, keywords: Sequence[str]):
+        self.keywords = keywords
+        self.longest = max(map(len, keywords))
+        # The lookahead lets matches overlap; at each position the
+        # earliest-listed keyword wins, the same tie-break extractOne uses
+        self.pattern = re.compile("(?=(%s))" % _alternation(keywords))
+    
+    def first(self, text: str) -> Optional[str]:
+        """Earliest-listed keyword contained in text, or None
+        
+        Texts shorter than a keyword are left to the fuzzy matcher, since
+        partial_ratio also gives 100 when the text sits inside a keyword.
+        """
+        if len(text) < self.longest:
+            return None
+        hits = {m.group(1) for m in self.pattern.finditer(text)}
+        return next((keyword for keyword in self.keywords if keyword in hits), None)
+
+# Exact lookups for the per-word matchers and one scanner per vocabulary
+# matched with partial_ratio; fuzzy matching only runs when these miss
+_TARGET_SET = frozenset(TARGET_WORDS)
+_SYSTEM_SET = frozenset(SYSTEM_WORDS)
+_BROWSER_SET = frozenset(BROWSER_WORDS)
+_DOCUMENT_SCANNER = _KeywordScanner(DOCUMENT_WORDS)
+_APP_SCANNER = _KeywordScanner(APP_WORDS)
+_FILE_OP_SCANNER = _KeywordScanner(FILE_OP_WORDS)
+_PERSONAL_SCANNER = _KeywordScanner(PERSONAL_WORDS)
+_EMAIL_SCANNER = _KeywordScanner(EMAIL_WORDS)
+
+def preprocess_natural_language(user_input: str) -> str:
     """Preprocess natural language input to extract intent"""
     text = user_input.lower().strip()
     
-    # Handle conversational starters
-    conversational_starters = [
-        "hey", "hi", "hello", "can you", "could you", "would you", "please",
-        "i want to", "i need to", "i would like to", "help me", "make me",
-        "do this", "can it", "is it possible", "how do i", "how can i"
-    ]
-    
-    # Remove conversational starters
-    for starter in conversational_starters:
-        if text.startswith(starter):
-            text = text[len(starter):].strip()
-        # Also handle mid-sentence patterns
-        text = text.replace(f" {starter} ", " ")
-    
-    # Handle question patterns
-    question_patterns = [
-        ("can you make me a", "create"),
-        ("make me a", "create"),
-        ("create me a", "create"),
-        ("i want to create", "create"),
-        ("i need to make", "create"),
-        ("help me create", "create"),
-        ("help me make", "create"),
-        ("can you open", "open"),
-        ("open up", "open"),
-        ("i want to open", "open"),
-        ("launch", "open"),
-        ("start", "open"),
-        ("run", "open"),
-        ("show me", "list"),
-        ("display", "list"),
-        ("let me see", "list"),
-        ("i want to see", "list"),
-        ("what are my", "list"),
-        ("list my", "list"),
-        ("find me", "search"),
-        ("look for", "search"),
-        ("search for", "search"),
-        ("can you find", "search"),
-        ("where is", "search"),
-        ("locate", "search"),
-        ("delete this", "delete"),
-        ("remove this", "delete"),
-        ("get rid of", "delete"),
-        ("clean up", "clean"),
-        ("tidy up", "organize"),
-        ("sort out", "organize"),
-        ("organize my", "organize"),
-        ("fix my", "optimize"),
-        ("speed up", "optimize"),
-        ("make faster", "optimize"),
-        ("improve", "optimize"),
-        ("secure my", "scan"),
-        ("protect my", "scan"),
-        ("check for viruses", "scan"),
-        ("scan my", "scan"),
-        ("backup my", "backup"),
-        ("save my", "backup"),
-        ("copy my", "backup"),
-        ("compress", "compress"),
-        ("zip", "compress"),
-        ("archive", "compress"),
-        ("extract", "extract"),
-        ("unzip", "extract"),
-        ("what can you do", "capabilities"),
-        ("what do you do", "capabilities"),
-        ("help", "capabilities"),
-        ("features", "capabilities")
-    ]
+    # Remove conversational starters, leading and mid-sentence
+    text = _LEADING_STARTERS_RE.sub("", text)
+    text = _INNER_STARTERS_RE.sub("", text)
     
     # Apply pattern replacements
-    for pattern, replacement in question_patterns:
-        if pattern in text:
-            text = text.replace(pattern, replacement)
+    text = _QUESTION_PATTERNS_RE.sub(lambda m: _QUESTION_REPLACEMENTS[m.group(0)], text)
     
     # Handle "what can you do" type questions
-    capability_questions = [
-        "what can you do", "what are your features", "what do you do",
-        "help me", "what's possible", "show capabilities", "list features"
-    ]
-    
-    for question in capability_questions:
-        if question in text:
-            return "list capabilities"
+    if _CAPABILITY_QUESTIONS_RE.search(text):
+        return "list capabilities"
     
     return text
 
-def find_best_action(user_input):
+# The find_* helpers and extract_location are pure functions of the input
+# text and are called several times per command, so their results are
+# memoized; assistants see the same commands (and typos) over and over.
+# The matchers and extractors below take text parse_command has already
+# lowercased and whitespace-normalized.
+_CACHE_SIZE = 512
+
+# Minimum fuzzy score for a match (the partial_ratio matchers need to beat it)
+_MATCH_CUTOFF = 70
+
+if RAPIDFUZZ_AVAILABLE:
+    def _partial_ratio(s1: str, s2: str, **kwargs) -> float:
+        """fuzzywuzzy's partial_ratio: the shorter string is only scored
+        against the windows of the longer one where a matching block lines
+        up, where RapidFuzz's partial_ratio tries every window"""
+        if s1 == s2:
+            return 100
+        if not s1 or not s2:
+            return 0
+        shorter, longer = (s1, s2) if len(s1) <= len(s2) else (s2, s1)
+        best = 0.0
+        for block in Levenshtein.opcodes(shorter, longer).as_matching_blocks():
+            start = max(block.b - block.a, 0)
+            ratio = Indel.normalized_similarity(shorter, longer[start:start + len(shorter)])
+            if ratio > .995:
+                return 100
+            best = max(best, ratio)
+        return 100 * best
+else:
+    _partial_ratio = fuzz.partial_ratio
+
+def _extract_one(query: str, choices: Sequence[str],
+                 scorer: Callable = fuzz.ratio) -> Optional[Tuple[str, int]]:
+    """process.extractOne as fuzzywuzzy scored it: scores are rounded to
+    whole numbers and the earliest choice wins a tie"""
+    matches = process.extract(query, choices, scorer=scorer, processor=_PROCESSOR, limit=None)
+    if not matches:
+        return None
+    scores = {match[0]: round(match[1]) for match in matches}
+    best = max(scores.values())
+    return next((choice, best) for choice in choices if scores.get(choice) == best)
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def find_best_action(lowered_input: str) -> Optional[str]:
     """Find the best matching action from user input"""
     # Preprocess natural language
-    processed_input = preprocess_natural_language(user_input)
+    processed_input = preprocess_natural_language(lowered_input)
     
     # Handle capability questions
     if processed_input == "list capabilities":
         return "capabilities"
     
-    words = processed_input.lower().split()
+    words = _POWER_OFF_RE.sub("poweroff", processed_input).split()
     
     # Check for specific patterns first
-    if any(phrase in user_input.lower() for phrase in ["where am i", "current location", "where"]):
+    if any(phrase in lowered_input for phrase in ["where am i", "current location", "where"]):
         return "where"
     
     # Check for system-specific patterns
-    if any(phrase in user_input.lower() for phrase in ["internet speed", "network speed", "connection speed"]):
+    if any(phrase in lowered_input for phrase in ["internet speed", "network speed", "connection speed"]):
         return "check"
     
-    if any(phrase in user_input.lower() for phrase in ["take screenshot", "capture screen"]):
+    if any(phrase in lowered_input for phrase in ["take screenshot", "capture screen"]):
         return "take"
     
-    for action, synonyms in ACTION_WORDS.items():
-        for word in words:
-            # Check each word against action synonyms
-            best_match = process.extractOne(word, synonyms, scorer=fuzz.ratio)
-            if best_match and best_match[1] >= 70:  # 70% similarity threshold
-                return action
+    # As if each action in ACTION_WORDS order tried every word against its
+    # synonyms: the first action any word matches wins. Repeated words
+    # can't change the outcome, so each is matched once
+    matched = set()
+    for word in dict.fromkeys(words):
+        matched |= _word_actions(word)
+    action = next((action for action in ACTION_WORDS if action in matched), None)
+    
+    # "power" used to pass for "poweroff" here; neither word of "power
+    # saving" is a verb, so route it to optimize's power saving rule
+    if action is None and "power saving" in lowered_input:
+        return "optimize"
+    return action
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def _word_actions(word: str) -> FrozenSet[str]:
+    """Actions with a synonym word matches, found in one pass over every
+    synonym; the destructive ones only match their exact verbs"""
+    matches = process.extract(word, _FUZZY_SYNONYMS, scorer=fuzz.ratio, processor=_PROCESSOR, limit=None)
+    actions = {_SYNONYM_TO_ACTION[match[0]] for match in matches if round(match[1]) >= _MATCH_CUTOFF}
+    exact_only = _EXACT_ONLY_WORDS.get(_PROCESSOR(word))
+    if exact_only:
+        actions.add(exact_only)
+    return frozenset(actions)
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def _action_for_word(word: str) -> Optional[str]:
+    """Action a single word names, or None"""
+    # Users mostly type the verb as-is, so try an exact synonym first;
+    # fuzzy matching is only needed for typos
+    action = _SYNONYM_TO_ACTION.get(word)
+    if action:
+        return action
+    # One pass over every synonym instead of one per action
+    best_match = _extract_one(word, _ALL_SYNONYMS)
+    if best_match and best_match[1] >= _MATCH_CUTOFF:
+        return _SYNONYM_TO_ACTION[best_match[0]]
     return None
 
-def find_target_word(user_input):
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def find_target_word(lowered_input: str) -> bool:
     """Find if user mentioned folder/directory"""
-    words = user_input.lower().split()
+    words = lowered_input.split()
     
-    for word in words:
-        best_match = process.extractOne(word, TARGET_WORDS, scorer=fuzz.ratio)
-        if best_match and best_match[1] >= 70:  # 70% similarity for "folder"
+    for word in dict.fromkeys(words):
+        if word in _TARGET_SET:
+            return True
+        best_match = _extract_one(word, TARGET_WORDS)
+        if best_match and best_match[1] >= _MATCH_CUTOFF:
             return True
     return False
 
-def find_system_word(user_input):
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def find_system_word(lowered_input: str) -> Optional[str]:
     """Find if user mentioned system-related words"""
-    words = user_input.lower().split()
+    words = lowered_input.split()
     
-    for word in words:
-        best_match = process.extractOne(word, SYSTEM_WORDS, scorer=fuzz.ratio)
-        if best_match and best_match[1] >= 70:
+    for word in dict.fromkeys(words):
+        if word in _SYSTEM_SET:
+            return word
+        best_match = _extract_one(word, SYSTEM_WORDS)
+        if best_match and best_match[1] >= _MATCH_CUTOFF:
             return best_match[0]
     return None
 
-def find_browser_word(user_input):
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def find_browser_word(lowered_input: str) -> Optional[str]:
     """Find if user mentioned browser-related words"""
-    words = user_input.lower().split()
+    words = lowered_input.split()
     
-    for word in words:
-        best_match = process.extractOne(word, BROWSER_WORDS, scorer=fuzz.ratio)
-        if best_match and best_match[1] >= 70:
+    for word in dict.fromkeys(words):
+        if word in _BROWSER_SET:
+            return word
+        best_match = _extract_one(word, BROWSER_WORDS)
+        if best_match and best_match[1] >= _MATCH_CUTOFF:
             return best_match[0]
     return None
 
-def find_document_word(user_input):
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def find_document_word(lowered_input: str) -> Optional[str]:
     """Find if user mentioned document-related words"""
-    words = user_input.lower().split()
-    
-    best_match = process.extractOne(" ".join(words), DOCUMENT_WORDS, scorer=fuzz.partial_ratio)
-    if best_match and best_match[1] > 70:
+    keyword = _DOCUMENT_SCANNER.first(lowered_input)
+    if keyword:
+        return keyword
+    best_match = _extract_one(lowered_input, DOCUMENT_WORDS, _partial_ratio)
+    if best_match and best_match[1] > _MATCH_CUTOFF:
         return best_match[0]
     return None
 
-def find_app_word(user_input):
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def find_app_word(lowered_input: str) -> Optional[str]:
     """Find if user mentioned application-related words"""
-    words = user_input.lower().split()
-    
-    best_match = process.extractOne(" ".join(words), APP_WORDS, scorer=fuzz.partial_ratio)
-    if best_match and best_match[1] > 70:
+    keyword = _APP_SCANNER.first(lowered_input)
+    if keyword:
+        return keyword
+    best_match = _extract_one(lowered_input, APP_WORDS, _partial_ratio)
+    if best_match and best_match[1] > _MATCH_CUTOFF:
         return best_match[0]
     return None
 
-def find_file_op_word(user_input):
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def find_file_op_word(lowered_input: str) -> Optional[str]:
     """Find if user mentioned file operation-related words"""
-    words = user_input.lower().split()
-    
-    best_match = process.extractOne(" ".join(words), FILE_OP_WORDS, scorer=fuzz.partial_ratio)
-    if best_match and best_match[1] > 70:
+    keyword = _FILE_OP_SCANNER.first(lowered_input)
+    if keyword:
+        return keyword
+    best_match = _extract_one(lowered_input, FILE_OP_WORDS, _partial_ratio)
+    if best_match and best_match[1] > _MATCH_CUTOFF:
         return best_match[0]
     return None
 
-def find_personal_word(user_input):
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def find_personal_word(lowered_input: str) -> Optional[str]:
     """Find if user mentioned personalization-related words"""
-    words = user_input.lower().split()
-    
-    best_match = process.extractOne(" ".join(words), PERSONAL_WORDS, scorer=fuzz.partial_ratio)
-    if best_match and best_match[1] > 70:
+    keyword = _PERSONAL_SCANNER.first(lowered_input)
+    if keyword:
+        return keyword
+    best_match = _extract_one(lowered_input, PERSONAL_WORDS, _partial_ratio)
+    if best_match and best_match[1] > _MATCH_CUTOFF:
         return best_match[0]
     return None
 
-def find_email_word(user_input):
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def find_email_word(lowered_input: str) -> Optional[str]:
     """Find if user mentioned email-related words"""
-    words = user_input.lower().split()
-    
-    best_match = process.extractOne(" ".join(words), EMAIL_WORDS, scorer=fuzz.partial_ratio)
-    if best_match and best_match[1] > 70:
+    keyword = _EMAIL_SCANNER.first(lowered_input)
+    if keyword:
+        return keyword
+    best_match = _extract_one(lowered_input, EMAIL_WORDS, _partial_ratio)
+    if best_match and best_match[1] > _MATCH_CUTOFF:
         return best_match[0]
     return None
 
-def extract_name(user_input, action):
+# Name after a target keyword, most specific first. Kept as separate patterns
+# because an earlier pattern wins even when a later one matches further left
+_NAME_PATTERNS = [
+    re.compile(r'(?:folder|directory|dir)\s+(?:called\s+|named\s+)?(\w+)'),
+    re.compile(r'(?:file)\s+(?:called\s+|named\s+)?(\w+(?:\.\w+)?)'),
+    re.compile(r'(?:called|named)\s+(\w+(?:\.\w+)?)'),
+]
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def extract_name(lowered_input: str, action: str) -> Optional[str]:
     """Extract file/folder name using multiple strategies"""
-    words = user_input.lower().split()
+    words = lowered_input.split()
     
     # Strategy 1: Look for pattern after target keyword
-    patterns = [
-        r'(?:folder|directory|dir)\s+(?:called\s+|named\s+)?(\w+)',
-        r'(?:file)\s+(?:called\s+|named\s+)?(\w+(?:\.\w+)?)',
-        r'(?:called|named)\s+(\w+(?:\.\w+)?)',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, user_input.lower())
+    for pattern in _NAME_PATTERNS:
+        match = pattern.search(lowered_input)
         if match:
             return match.group(1)
     
     # Strategy 2: Take the last word if it's not reserved
     if len(words) >= 2:
         last_word = words[-1]
-        all_reserved_words = get_all_reserved_words()
         
-        if last_word not in all_reserved_words:
+        if last_word not in _RESERVED:
             return last_word
     
     # Strategy 3: Look for word after action words
     for i, word in enumerate(words):
-        for synonyms in ACTION_WORDS.values():
-            best_match = process.extractOne(word, synonyms, scorer=fuzz.ratio)
-            if best_match and best_match[1] >= 70:
-                # Found action word, look for name after it
-                for j in range(i + 1, len(words)):
-                    candidate = words[j]
-                    all_reserved_words = get_all_reserved_words()
-                    if candidate not in all_reserved_words:
-                        return candidate
+        if _action_for_word(word):
+            # Found action word, look for name after it
+            for j in range(i + 1, len(words)):
+                candidate = words[j]
+                if candidate not in _RESERVED:
+                    return candidate
     
     return None
 
-def extract_location(user_input):
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def extract_location(lowered_input: str) -> Optional[str]:
     """Extract location from user input"""
-    words = user_input.lower().split()
+    words = lowered_input.split()
     
     # Look for location indicators
     location_indicators = ["at", "in", "to"]
@@ -333,15 +504,14 @@ def extract_location(user_input):
     
     return None
 
-def extract_two_names(user_input):
+def extract_two_names(lowered_input: str) -> Tuple[Optional[str], Optional[str]]:
     """Extract two names for operations like rename or move"""
-    words = user_input.lower().split()
-    all_reserved_words = get_all_reserved_words()
+    words = lowered_input.split()
     
     # Find non-reserved words that could be names
     potential_names = []
     for word in words:
-        if word not in all_reserved_words and len(word) > 1:
+        if word not in _RESERVED and len(word) > 1:
             potential_names.append(word)
     
     if len(potential_names) >= 2:
@@ -351,948 +521,873 @@ def extract_two_names(user_input):
     
     return None, None
 
-def get_all_reserved_words():
+# Built once; name extraction tests membership for every candidate word
+_RESERVED = frozenset(itertools.chain(
+    *ACTION_WORDS.values(), TARGET_WORDS, LOCATION_WORDS,
+    SYSTEM_WORDS, BROWSER_WORDS, DOCUMENT_WORDS
+))
+
+def get_all_reserved_words() -> FrozenSet[str]:
     """Get all reserved words that shouldn't be considered as names"""
-    all_reserved_words = []
-    for synonyms in ACTION_WORDS.values():
-        all_reserved_words.extend(synonyms)
-    all_reserved_words.extend(TARGET_WORDS)
-    all_reserved_words.extend(LOCATION_WORDS)
-    all_reserved_words.extend(SYSTEM_WORDS)
-    all_reserved_words.extend(BROWSER_WORDS)
-    all_reserved_words.extend(DOCUMENT_WORDS)
-    return all_reserved_words
-
-def parse_command(user_input):
-    """
-    Parse user input and detect intent with comprehensive command support
-    """
-    if not user_input.strip():
-        return None, None, None
-    
-    # Store original input for parameter extraction
-    original_input = user_input
-    
-    # Find the action using preprocessed input
-    action = find_best_action(user_input)
-    if not action:
+    return _RESERVED
+
+# A whole word made of digits, i.e. what word.isdigit() picks out of split()
+_NUMBER_RE = re.compile(r"(?<!\S)(\d+)(?!\S)")
+def _first_int(text: str, default: int) -> int:
+    """First whole-word number in text, or default"""
+    match = _NUMBER_RE.search(text)
+    return int(match.group(1)) if match else default
+
+# Volume level or mute/unmute
+_VOLUME_ARG_RE = re.compile(r"(?<!\S)(?:(\d+)|(mute|unmute))(?!\S)")
+
+def _parse_where(lowered: str) -> ParseResult:
+    """Where am I / current location"""
+    return "where", None, None
+
+def _parse_back(lowered: str) -> ParseResult:
+    """Go back"""
+    return "back", None, None
+
+def _parse_navigate(lowered: str) -> ParseResult:
+    """Navigation commands"""
+    location = extract_location(lowered)
+    if location:
+        return "navigate", location, None
+    else:
         return None, None, None
-    
-    # Handle different command types
-    
-    # WHERE AM I / CURRENT LOCATION
-    if action == "where":
-        return "where", None, None
-    
-    # GO BACK
-    if action == "back":
-        return "back", None, None
-    
-    # NAVIGATION COMMANDS
-    if action == "navigate":
-        location = extract_location(user_input)
-        if location:
-            return "navigate", location, None
-        else:
-            return None, None, None
-    
-    # LIST COMMANDS
-    if action == "list":
-        has_target = find_target_word(user_input)
-        if has_target:
-            # Determine if listing files or folders
-            if "file" in user_input.lower():
-                return "list files", None, None
-            elif "folder" in user_input.lower() or "director" in user_input.lower():
-                return "list folders", None, None
-            else:
-                return "list all", None, None
-        else:
-            # Default to listing main folders if no target specified
-            return "list main", None, None
-    
-    # SEARCH COMMANDS
-    if action == "search":
-        name = extract_name(user_input, action)
-        if name:
-            # Check if recursive search is requested
-            lower = user_input.lower()
-            recursive = any(word in lower for word in ["everywhere", "all", "recursive", "subfolder"])
-
-            # Detect explicit system-wide search requests
-            system_wide_phrases = [
-                "whole system",
-                "entire system",
-                "entire filesystem",
-                "whole filesystem",
-                "search the system",
-                "search the whole system",
-                "scan entire",
-                "search /",
-                "scan /",
-                # additional natural phrases / synonyms
-                "all drives",
-                "everywhere",
-                "across all drives",
-                "across drives",
-                "across filesystem",
-                "search all drives",
-                "search entire disk",
-                "search entire drive",
-                "search root",
-                "scan the disk",
-                "scan the whole drive",
-            ]
-
-            system_wide = any(phrase in lower for phrase in system_wide_phrases)
-
-            if system_wide:
-                # special command to indicate a system-wide scan
-                return "search files system", name, True
-
-            return "search files", name, recursive
-        else:
-            return None, None, None
-    
-    # RENAME COMMANDS
-    if action == "rename":
-        old_name, new_name = extract_two_names(user_input)
-        if old_name and new_name:
-            return "rename file", old_name, new_name
-        else:
-            return None, None, None
-    
-    # MOVE COMMANDS
-    if action == "move":
-        file_name = extract_name(user_input, action)
-        location = extract_location(user_input)
-        if file_name and location:
-            return "move file", file_name, location
-        else:
-            return None, None, None
-    
-    # CREATE COMMANDS
-    if action == "create":
-        has_target = find_target_word(user_input)
-        name = extract_name(user_input, action)
-        location = extract_location(user_input)
-        
-        if name:
-            if "file" in user_input.lower() or "." in name:
-                return "create file", name, location
-            else:
-                return "create folder", name, location
-        else:
-            return None, None, None
-    
-    # DELETE COMMANDS
-    if action == "delete":
-        has_target = find_target_word(user_input)
-        name = extract_name(user_input, action)
-        
-        if name:
-            if "file" in user_input.lower() or "." in name:
-                return "delete file", name, None
-            else:
-                return "delete folder", name, None
+
+def _parse_list(lowered: str) -> ParseResult:
+    """List commands"""
+    has_target = find_target_word(lowered)
+    if has_target:
+        # Determine if listing files or folders
+        if "file" in lowered:
+            return "list files", None, None
+        elif "folder" in lowered or "director" in lowered:
+            return "list folders", None, None
         else:
-            return None, None, None
-    
-    # SYSTEM COMMANDS
-    
-    # CHECK COMMANDS (storage, internet, etc.)
-    if action == "check":
-        system_target = find_system_word(user_input)
-        if system_target:
-            if system_target in ["storage", "disk", "space"]:
-                return "check storage", None, None
-            elif system_target in ["internet", "speed"]:
-                return "check internet", None, None
-            elif system_target in ["processes", "process"]:
-                return "list processes", None, None
-            elif system_target == "system":
-                return "system info", None, None
-        return None, None, None
-    
-    # CONNECT COMMANDS (WiFi)
-    if action == "connect":
-        if "wifi" in user_input.lower() or "network" in user_input.lower():
-            network_name = extract_name(user_input, action)
-            return "connect wifi", network_name, None
-        return None, None, None
-    
-    # ADJUST COMMANDS (volume)
-    if action == "adjust":
-        if "volume" in user_input.lower() or "sound" in user_input.lower():
-            # Extract volume level or action
-            words = user_input.lower().split()
-            for word in words:
-                if word.isdigit():
-                    return "adjust volume", int(word), None
-                elif word in ["mute", "unmute"]:
-                    return "adjust volume", None, word
-            return "get volume", None, None
-        return None, None, None
-    
-    # TAKE COMMANDS (screenshot)
-    if action == "take":
-        if "screenshot" in user_input.lower() or "screen" in user_input.lower():
-            filename = extract_name(user_input, action)
-            return "take screenshot", filename, None
-        return None, None, None
-    
-    # KILL COMMANDS (processes)
-    if action == "kill":
-        if "process" in user_input.lower():
-            process_name = extract_name(user_input, action)
-            return "kill process", process_name, None
+            return "list all", None, None
+    else:
+        # Default to listing main folders if no target specified
+        return "list main", None, None
+
+# "find <keyword>" reports, checked in this order before a name search
+_FIND_COMMANDS = {
+    "duplicates": "find duplicates",
+    "large": "find large files",
+    "unused": "find unused files",
+    "todo": "find todos",
+    "todos": "find todos",
+}
+
+def _parse_search(lowered: str) -> ParseResult:
+    """Search commands"""
+    words = set(lowered.split())
+    if "find" in words:
+        for keyword, command in _FIND_COMMANDS.items():
+            if keyword in words:
+                return command, extract_location(lowered), None
+    
+    name = extract_name(lowered, "search")
+    if name:
+        # Check if recursive search is requested
+        recursive = any(word in lowered for word in ["everywhere", "all", "recursive", "subfolder"])
+
+        # Detect explicit system-wide search requests
+        system_wide_phrases = [
+            "whole system",
+            "entire system",
+            "entire filesystem",
+            "whole filesystem",
+            "search the system",
+            "search the whole system",
+            "scan entire",
+            "search /",
+            "scan /",
+            # additional natural phrases / synonyms
+            "all drives",
+            "everywhere",
+            "across all drives",
+            "across drives",
+            "across filesystem",
+            "search all drives",
+            "search entire disk",
+            "search entire drive",
+            "search root",
+            "scan the disk",
+            "scan the whole drive",
+        ]
+
+        system_wide = any(phrase in lowered for phrase in system_wide_phrases)
+
+        if system_wide:
+            # special command to indicate a system-wide scan
+            return "search files system", name, True
+
+        return "search files", name, recursive
+    else:
         return None, None, None
-    
-    # SHUTDOWN COMMANDS
-    if action == "shutdown":
-        # Extract delay if specified
-        words = user_input.lower().split()
-        for i, word in enumerate(words):
-            if word.isdigit():
-                return "shutdown", int(word), None
-            elif word in ["in", "after"] and i + 1 < len(words) and words[i + 1].isdigit():
-                return "shutdown", int(words[i + 1]), None
-        return "shutdown", 0, None
-    
-    # RESTART COMMANDS
-    if action == "restart":
-        # Extract delay if specified
-        words = user_input.lower().split()
-        for i, word in enumerate(words):
-            if word.isdigit():
-                return "restart", int(word), None
-            elif word in ["in", "after"] and i + 1 < len(words) and words[i + 1].isdigit():
-                return "restart", int(words[i + 1]), None
-        return "restart", 0, None
-    
-    # CANCEL COMMANDS
-    if action == "cancel":
-        if "shutdown" in user_input.lower() or "restart" in user_input.lower():
-            return "cancel shutdown", None, None
+
+def _parse_rename(lowered: str) -> ParseResult:
+    """Rename commands"""
+    old_name, new_name = extract_two_names(lowered)
+    if old_name and new_name:
+        return "rename file", old_name, new_name
+    else:
         return None, None, None
-    
-    # BROWSER COMMANDS
-    if action == "open":
-        browser_target = find_browser_word(user_input)
-        if browser_target:
-            # Determine browser and site
-            browsers = ["firefox", "chrome", "edge"]
-            sites = ["gmail", "google", "youtube", "facebook", "twitter", "linkedin", "github", "stackoverflow"]
-            
-            browser = "default"
-            site = None
-            
-            # Find browser
-            for b in browsers:
-                if b in user_input.lower():
-                    browser = b
-                    break
-            
-            # Find site
-            for s in sites:
-                if s in user_input.lower():
-                    site = s
-                    break
-            
-            if site:
-                return "open browser site", browser, site
-            elif browser_target in browsers:
-                return "open browser", browser_target, None
-            else:
-                return "open browser site", browser, browser_target
+
+def _parse_move(lowered: str) -> ParseResult:
+    """Move commands"""
+    file_name = extract_name(lowered, "move")
+    location = extract_location(lowered)
+    if file_name and location:
+        return "move file", file_name, location
+    else:
         return None, None, None
-    
-    if action == "close":
-        browser_target = find_browser_word(user_input)
-        if browser_target and browser_target in ["browser", "firefox", "chrome", "edge"]:
-            return "close browser", browser_target, None
+
+def _parse_create(lowered: str) -> ParseResult:
+    """Create commands"""
+    name = extract_name(lowered, "create")
+    location = extract_location(lowered)
+
+    if name:
+        if "file" in lowered or "." in name:
+            return "create file", name, location
+        else:
+            return "create folder", name, location
+    else:
         return None, None, None
-    
-    # DOCUMENT COMMANDS
-    if action == "create":
-        doc_target = find_document_word(user_input)
-        if doc_target and doc_target in ["document", "word", "docx"]:
-            name = extract_name(user_input, action)
-            return "create document", name, None
-        # Fall through to existing create logic if not document
-    
-    if action == "open":
-        doc_target = find_document_word(user_input)
-        if doc_target:
-            filename = extract_name(user_input, action)
-            if filename:
-                return "open document", filename, None
-        # Fall through to existing open logic if not document
-    
-    if action == "convert":
-        if "docx" in user_input.lower() and "pdf" in user_input.lower():
-            filename = extract_name(user_input, action)
-            if "to pdf" in user_input.lower():
-                return "convert docx pdf", filename, None
-            elif "to docx" in user_input.lower():
-                return "convert pdf docx", filename, None
+
+def _parse_delete(lowered: str) -> ParseResult:
+    """Delete commands"""
+    name = extract_name(lowered, "delete")
+
+    if name:
+        if "file" in lowered or "." in name:
+            return "delete file", name, None
+        else:
+            return "delete folder", name, None
+    else:
         return None, None, None
-    
-    if action == "search":
-        doc_target = find_document_word(user_input)
-        if doc_target:
-            # Extract search term and filename
-            words = user_input.lower().split()
-            search_term = None
-            filename = None
-            
-            # Look for "search for X in Y" pattern
-            if "for" in words and "in" in words:
-                for_idx = words.index("for")
-                in_idx = words.index("in")
-                if for_idx < in_idx:
-                    search_term = " ".join(words[for_idx + 1:in_idx])
-                    filename = " ".join(words[in_idx + 1:])
-            
-            if search_term and filename:
-                return "search document", search_term, filename
-        # Fall through to existing search logic if not document search
-    
-    if action == "extract":
-        doc_target = find_document_word(user_input)
-        if doc_target:
-            filename = extract_name(user_input, action)
-            if filename:
-                return "extract text", filename, None
+
+def _parse_check(lowered: str) -> ParseResult:
+    """Check commands (storage, internet, etc.)"""
+    system_target = find_system_word(lowered)
+    if system_target:
+        if system_target in ["storage", "disk", "space"]:
+            return "check storage", None, None
+        elif system_target in ["internet", "speed"]:
+            return "check internet", None, None
+        elif system_target in ["processes", "process"]:
+            return "list processes", None, None
+        elif system_target == "system":
+            return "system info", None, None
+    return None, None, None
+
+def _parse_connect(lowered: str) -> ParseResult:
+    """Connect commands (WiFi)"""
+    if "wifi" in lowered or "network" in lowered:
+        network_name = extract_name(lowered, "connect")
+        return "connect wifi", network_name, None
+    return None, None, None
+
+def _parse_adjust(lowered: str) -> ParseResult:
+    """Adjust commands (volume)"""
+    if "volume" in lowered or "sound" in lowered:
+        # Extract volume level or action, whichever comes first
+        match = _VOLUME_ARG_RE.search(lowered)
+        if match and match.group(1):
+            return "adjust volume", int(match.group(1)), None
+        elif match:
+            return "adjust volume", None, match.group(2)
+        return "get volume", None, None
+    return None, None, None
+
+def _parse_take(lowered: str) -> ParseResult:
+    """Take commands (screenshot)"""
+    if "screenshot" in lowered or "screen" in lowered:
+        filename = extract_name(lowered, "take")
+        return "take screenshot", filename, None
+    return None, None, None
+
+def _parse_kill(lowered: str) -> ParseResult:
+    """Kill commands (processes)"""
+    if "process" in lowered:
+        process_name = extract_name(lowered, "kill")
+        return "kill process", process_name, None
+    return None, None, None
+
+# Besides the verb and a delay, a shutdown or restart command may only name
+# the computer; "restart the browser" or "reset my password" is about
+# something else
+_POWER_COMMAND_WORDS = frozenset(_EXACT_ONLY_WORDS) | {
+    "power", "off", "the", "my", "this", "computer", "pc", "laptop",
+    "machine", "system", "now", "in", "after", "min", "mins", "minute", "minutes",
+}
+_WORD_RE = re.compile(r"\w+")
+
+def _names_only_the_computer(lowered: str) -> bool:
+    """True if a shutdown or restart command has nothing else as its object"""
+    return all(word in _POWER_COMMAND_WORDS or word.isdigit()
+               for word in _WORD_RE.findall(preprocess_natural_language(lowered)))
+
+def _parse_shutdown(lowered: str) -> ParseResult:
+    """Shutdown commands"""
+    if not _names_only_the_computer(lowered):
         return None, None, None
-    
-    if action == "summarize":
-        doc_target = find_document_word(user_input)
-        if doc_target:
-            filename = extract_name(user_input, action)
-            if filename:
-                return "summarize document", filename, None
+    # Extract delay if specified ("in 10", "after 10" or just "10")
+    return "shutdown", _first_int(lowered, 0), None
+
+def _parse_restart(lowered: str) -> ParseResult:
+    """Restart commands"""
+    if not _names_only_the_computer(lowered):
         return None, None, None
-    
-    if action == "list":
-        doc_target = find_document_word(user_input)
-        if doc_target:
-            return "list documents", None, None
-        # Fall through to existing list logic if not document list
-    
-    # ==================== NEW ENHANCED FEATURES ====================
-    
-    # BRIGHTNESS CONTROL
-    if action == "adjust" and "brightness" in user_input.lower():
-        if "increase" in user_input.lower():
-            return "brightness increase", None, None
-        elif "decrease" in user_input.lower():
-            return "brightness decrease", None, None
+    # Extract delay if specified ("in 10", "after 10" or just "10")
+    return "restart", _first_int(lowered, 0), None
+
+def _parse_cancel(lowered: str) -> ParseResult:
+    """Cancel commands"""
+    if "shutdown" in lowered or "restart" in lowered:
+        return "cancel shutdown", None, None
+    return None, None, None
+
+def _parse_open(lowered: str) -> ParseResult:
+    """Browser commands"""
+    browser_target = find_browser_word(lowered)
+    if browser_target:
+        # Determine browser and site
+        browsers = ["firefox", "chrome", "edge"]
+        sites = ["gmail", "google", "youtube", "facebook", "twitter", "linkedin", "github", "stackoverflow"]
+
+        browser = "default"
+        site = None
+
+        # Find browser
+        for b in browsers:
+            if b in lowered:
+                browser = b
+                break
+
+        # Find site
+        for s in sites:
+            if s in lowered:
+                site = s
+                break
+
+        if site:
+            return "open browser site", browser, site
+        elif browser_target in browsers:
+            return "open browser", browser_target, None
         else:
-            # Extract brightness level
-            words = user_input.lower().split()
-            for word in words:
-                if word.isdigit():
-                    return "brightness set", int(word), None
-        return "brightness get", None, None
-    
-    # LOCK/LOGOUT COMMANDS
-    if action == "lock":
-        if "computer" in user_input.lower() or "screen" in user_input.lower():
-            return "lock computer", None, None
-    
-    if action == "logout":
-        return "logout user", None, None
-    
-    # BATTERY COMMANDS
-    if action == "check" and "battery" in user_input.lower():
-        return "battery status", None, None
-    
-    if action == "optimize" and "battery" in user_input.lower():
+            return "open browser site", browser, browser_target
+    return None, None, None
+
+def _parse_close(lowered: str) -> ParseResult:
+    """Close browser commands"""
+    browser_target = find_browser_word(lowered)
+    if browser_target and browser_target in ["browser", "firefox", "chrome", "edge"]:
+        return "close browser", browser_target, None
+    return None, None, None
+
+def _parse_convert(lowered: str) -> ParseResult:
+    """Document conversion commands"""
+    if "docx" in lowered and "pdf" in lowered:
+        filename = extract_name(lowered, "convert")
+        if "to pdf" in lowered:
+            return "convert docx pdf", filename, None
+        elif "to docx" in lowered:
+            return "convert pdf docx", filename, None
+    return None, None, None
+
+def _parse_extract(lowered: str) -> ParseResult:
+    """Text extraction commands"""
+    doc_target = find_document_word(lowered)
+    if doc_target:
+        filename = extract_name(lowered, "extract")
+        if filename:
+            return "extract text", filename, None
+    return None, None, None
+
+def _parse_summarize(lowered: str) -> ParseResult:
+    """Document summary commands"""
+    doc_target = find_document_word(lowered)
+    if doc_target:
+        filename = extract_name(lowered, "summarize")
+        if filename:
+            return "summarize document", filename, None
+    return None, None, None
+
+# Actions whose handling doesn't depend on anything else in the command;
+# parse_command dispatches these straight to their parser
+_ACTION_PARSERS: Dict[str, Callable[[str], ParseResult]] = {
+    "where": _parse_where,
+    "back": _parse_back,
+    "navigate": _parse_navigate,
+    "list": _parse_list,
+    "search": _parse_search,
+    "rename": _parse_rename,
+    "move": _parse_move,
+    "create": _parse_create,
+    "delete": _parse_delete,
+    "check": _parse_check,
+    "connect": _parse_connect,
+    "adjust": _parse_adjust,
+    "take": _parse_take,
+    "kill": _parse_kill,
+    "shutdown": _parse_shutdown,
+    "restart": _parse_restart,
+    "cancel": _parse_cancel,
+    "open": _parse_open,
+    "close": _parse_close,
+    "convert": _parse_convert,
+    "extract": _parse_extract,
+    "summarize": _parse_summarize,
+}
+
+# ==================== KEYWORD RULES ====================
+#
+# Commands for actions without a parser above are recognised by keywords.
+# Each rule is registered under keywords (or actions) that must be present
+# for it to match, so parse_command only tries the rules that can; rules are
+# tried in registration order and the first result wins.
+
+class _Command:
+    """A command being matched against the keyword rules"""
+    
+    __slots__ = ("text", "lowered", "tokens", "tokens_low", "token_index")
+    
+    def __init__(self, text: str, lowered: str):
+        self.text = text  # as typed, for arguments where case matters
+        self.lowered = lowered
+        # Split once for every rule; tokens_low[i] is tokens[i] lowercased
+        self.tokens = text.split()
+        self.tokens_low = lowered.split()
+        # Position of each lowercased token's first occurrence
+        self.token_index: Dict[str, int] = {}
+        for i, token in enumerate(self.tokens_low):
+            self.token_index.setdefault(token, i)
+
+def _extract_after(tokens: List[str], token_index: Dict[str, int], key: str) -> Optional[str]:
+    """The token following the first `key` token, or None"""
+    idx = token_index.get(key, -1)
+    return tokens[idx + 1] if 0 <= idx and idx + 1 < len(tokens) else None
+
+# Argument spotting shared by the rules below
+_VIDEO_URL_RE = re.compile(r"http|youtube|youtu\.be")
+_REPO_URL_RE = re.compile(r"github\.com|gitlab\.com|\.git")
+_CITATION_STYLES = frozenset({"apa", "mla", "chicago", "harvard", "ieee"})
+_DATE_WORDS = ("yesterday", "last tuesday", "last week", "this morning", "last month")
+
+_Rule = Callable[[_Command], Optional[ParseResult]]
+
+_RULES: List[_Rule] = []
+_RULES_BY_KEYWORD: Dict[str, List[int]] = {}
+_RULES_BY_ACTION: Dict[str, List[int]] = {}
+
+def _rule(*keywords: str, actions: Sequence[str] = ()) -> Callable[[_Rule], _Rule]:
+    """Register a rule, tried when one of keywords occurs in the command or
+    its action is one of actions"""
+    def register(rule: _Rule) -> _Rule:
+        index = len(_RULES)
+        _RULES.append(rule)
+        for keyword in keywords:
+            _RULES_BY_KEYWORD.setdefault(keyword, []).append(index)
+        for action in actions:
+            _RULES_BY_ACTION.setdefault(action, []).append(index)
+        return rule
+    return register
+
+class _KeywordRule:
+    """A rule matching when all of `required` and, if given, one of `any_of`
+    occur in the command; `extract` supplies its two arguments"""
+    
+    __slots__ = ("intent", "required", "any_of", "extract")
+    
+    def __init__(self, intent: str, required: Sequence[str], any_of: Sequence[str],
+                 extract: Optional[Callable[[_Command], Tuple[Any, Any]]]):
+        self.intent = intent
+        self.required = required
+        self.any_of = any_of
+        self.extract = extract
+    
+    def __call__(self, cmd: _Command) -> Optional[ParseResult]:
+        lowered = cmd.lowered
+        if not all(keyword in lowered for keyword in self.required):
+            return None
+        if self.any_of and not any(keyword in lowered for keyword in self.any_of):
+            return None
+        if self.extract is None:
+            return self.intent, None, None
+        return (self.intent,) + self.extract(cmd)
+
+def _keyword_rule(intent: str, required: Sequence[str] = (), any_of: Sequence[str] = (),
+                  extract: Optional[Callable[[_Command], Tuple[Any, Any]]] = None) -> None:
+    """Register a _KeywordRule. Required keywords are listed rarest first and
+    the rule is indexed under the first; with none, under each of any_of"""
+    _rule(*(required[:1] or any_of))(_KeywordRule(intent, required, any_of, extract))
+
+def _location_arg(cmd: _Command) -> Tuple[Any, Any]:
+    return extract_location(cmd.lowered), None
+
+def _name_arg(action: str) -> Callable[[_Command], Tuple[Any, Any]]:
+    return lambda cmd: (extract_name(cmd.lowered, action), None)
+
+# LOCK/LOGOUT COMMANDS
+@_rule(actions=["lock"])
+def _rule_lock_computer(cmd: _Command) -> Optional[ParseResult]:
+    if "computer" in cmd.lowered or "screen" in cmd.lowered:
+        return "lock computer", None, None
+    return None
+
+@_rule(actions=["logout"])
+def _rule_logout(cmd: _Command) -> Optional[ParseResult]:
+    return "logout user", None, None
+
+# BATTERY COMMANDS
+@_rule(actions=["optimize"])
+def _rule_battery_optimize(cmd: _Command) -> Optional[ParseResult]:
+    if "battery" in cmd.lowered:
         return "battery optimize", None, None
-    
-    # CPU MONITORING
-    if action == "monitor" and "cpu" in user_input.lower():
+    return None
+
+# CPU MONITORING
+@_rule(actions=["monitor"])
+def _rule_monitor_cpu(cmd: _Command) -> Optional[ParseResult]:
+    if "cpu" in cmd.lowered:
         return "monitor cpu", None, None
-    
-    if action == "check" and ("frozen" in user_input.lower() or "stuck" in user_input.lower()):
-        return "detect frozen", None, None
-    
-    # POWER SAVING
-    if "power" in user_input.lower() and "saving" in user_input.lower():
-        return "power saving", None, None
-    
-    # APPLICATION LAUNCHER
-    if action == "open" or action == "launch":
-        app_target = find_app_word(user_input)
-        if app_target:
-            return "launch app", app_target, None
-        
-        # Check for camera
-        if "camera" in user_input.lower():
-            return "open camera", None, None
-    
-    if action == "list" and ("apps" in user_input.lower() or "applications" in user_input.lower()):
-        if "recent" in user_input.lower():
-            return "list recent apps", None, None
-        else:
-            return "list available apps", None, None
-    
-    if "recent" in user_input.lower() and "files" in user_input.lower():
-        return "open recent files", None, None
-    
-    if "morning" in user_input.lower() and ("apps" in user_input.lower() or "routine" in user_input.lower()):
-        return "launch morning apps", None, None
-    
-    if "work" in user_input.lower() and ("apps" in user_input.lower() or "routine" in user_input.lower()):
-        return "launch work apps", None, None
-    
-    # FILE ORGANIZATION
-    if action == "organize":
-        if "files" in user_input.lower():
-            return "organize files", extract_location(user_input), None
-        elif "desktop" in user_input.lower():
-            return "organize files", "desktop", None
-        elif "downloads" in user_input.lower():
-            return "organize files", "downloads", None
-    
-    if action == "rename" and "pattern" in user_input.lower():
-        # Extract directory and patterns
-        return "rename pattern", extract_location(user_input), extract_name(user_input, action)
-    
-    # DUPLICATE FILES
-    if action == "find" and "duplicates" in user_input.lower():
-        return "find duplicates", extract_location(user_input), None
-    
-    # LARGE FILES
-    if action == "find" and "large" in user_input.lower():
-        return "find large files", extract_location(user_input), None
-    
-    # UNUSED FILES
-    if action == "find" and "unused" in user_input.lower():
-        return "find unused files", extract_location(user_input), None
-    
-    # COMPRESSION
-    if action == "compress":
-        return "compress folder", extract_location(user_input), None
-    
-    if action == "extract":
-        return "extract archive", extract_name(user_input, action), None
-    
-    # NATURAL LANGUAGE SEARCH
-    if action == "search" or action == "find":
-        # Check if it's a natural language query
-        if any(word in user_input.lower() for word in ["about", "pdf", "image", "photo", "document", "video"]):
-            return "smart search", user_input, None
-    
-    # BACKUP
-    if action == "backup":
-        return "backup files", extract_location(user_input), None
-    
-    if action == "list" and "backup" in user_input.lower():
-        return "list backups", None, None
-    
-    # SECURITY & CLEANUP
-    if action == "scan":
-        if "security" in user_input.lower() or "virus" in user_input.lower() or "threats" in user_input.lower():
-            quick = "quick" in user_input.lower()
-            return "security scan", quick, None
-    
-    if action == "clean":
-        if "computer" in user_input.lower() or "system" in user_input.lower():
-            deep = "deep" in user_input.lower()
-            return "clean system", deep, None
-    
-    if action == "check" and "bloatware" in user_input.lower():
-        return "check bloatware", None, None
-    
-    if action == "optimize" and ("startup" in user_input.lower() or "boot" in user_input.lower()):
+    return None
+
+# POWER SAVING
+_keyword_rule("power saving", ("saving", "power"))
+
+# APPLICATION LAUNCHER
+_keyword_rule("open recent files", ("recent", "files"))
+_keyword_rule("launch morning apps", ("morning",), ("apps", "routine"))
+_keyword_rule("launch work apps", ("work",), ("apps", "routine"))
+
+# FILE ORGANIZATION
+@_rule(actions=["organize"])
+def _rule_organize(cmd: _Command) -> Optional[ParseResult]:
+    lowered = cmd.lowered
+    if "files" in lowered:
+        return "organize files", extract_location(lowered), None
+    elif "desktop" in lowered:
+        return "organize files", "desktop", None
+    elif "downloads" in lowered:
+        return "organize files", "downloads", None
+    return None
+
+# COMPRESSION
+@_rule(actions=["compress"])
+def _rule_compress(cmd: _Command) -> Optional[ParseResult]:
+    return "compress folder", extract_location(cmd.lowered), None
+
+# BACKUP
+@_rule(actions=["backup"])
+def _rule_backup(cmd: _Command) -> Optional[ParseResult]:
+    return "backup files", extract_location(cmd.lowered), None
+
+# SECURITY & CLEANUP
+@_rule(actions=["scan"])
+def _rule_security_scan(cmd: _Command) -> Optional[ParseResult]:
+    lowered = cmd.lowered
+    if "security" in lowered or "virus" in lowered or "threats" in lowered:
+        quick = "quick" in lowered
+        return "security scan", quick, None
+    return None
+
+@_rule(actions=["clean"])
+def _rule_clean_system(cmd: _Command) -> Optional[ParseResult]:
+    lowered = cmd.lowered
+    if "computer" in lowered or "system" in lowered:
+        deep = "deep" in lowered
+        return "clean system", deep, None
+    return None
+
+@_rule(actions=["optimize"])
+def _rule_optimize_startup(cmd: _Command) -> Optional[ParseResult]:
+    if "startup" in cmd.lowered or "boot" in cmd.lowered:
         return "optimize startup", None, None
-    
-    if action == "list" and "cleanup" in user_input.lower():
-        return "cleanup history", None, None
-    
-    # PERSONALIZATION
-    if action == "create" and "shortcut" in user_input.lower():
-        # Extract shortcut name and command
-        words = user_input.split()
-        try:
-            shortcut_idx = next(i for i, word in enumerate(words) if "shortcut" in word.lower())
-            if shortcut_idx + 1 < len(words):
-                shortcut_name = words[shortcut_idx + 1]
-                command = " ".join(words[shortcut_idx + 2:]) if shortcut_idx + 2 < len(words) else None
-                return "create shortcut", shortcut_name, command
-        except:
-            pass
-    
-    if action == "list" and "shortcuts" in user_input.lower():
-        return "list shortcuts", None, None
-    
-    if action == "suggest":
-        if "commands" in user_input.lower():
-            return "suggest commands", None, None
-        elif "apps" in user_input.lower():
-            return "suggest apps", None, None
-    
-    if action == "create" and "workflow" in user_input.lower():
-        return "create workflow", extract_name(user_input, action), None
-    
-    if action == "list" and "workflows" in user_input.lower():
-        return "list workflows", None, None
-    
-    if "run workflow" in user_input.lower():
-        return "run workflow", extract_name(user_input, "run"), None
-    
-    if action == "list" and ("favorites" in user_input.lower() or "favourite" in user_input.lower()):
-        return "list favorites", None, None
-    
-    if "add favorite" in user_input.lower():
-        return "add favorite", extract_location(user_input), None
-    
-    if action == "list" and "stats" in user_input.lower():
-        return "usage stats", None, None
-    
-    if "export data" in user_input.lower():
-        return "export data", None, None
-    
-    # EMAIL AUTOMATION
-    if action == "setup" and "email" in user_input.lower():
+    return None
+
+# PERSONALIZATION
+@_rule(actions=["suggest"])
+def _rule_suggest(cmd: _Command) -> Optional[ParseResult]:
+    if "commands" in cmd.lowered:
+        return "suggest commands", None, None
+    elif "apps" in cmd.lowered:
+        return "suggest apps", None, None
+    return None
+
+_keyword_rule("run workflow", ("run workflow",), extract=_name_arg("run"))
+_keyword_rule("add favorite", ("add favorite",), extract=_location_arg)
+_keyword_rule("export data", ("export data",))
+
+# EMAIL AUTOMATION
+@_rule(actions=["setup"])
+def _rule_setup_email(cmd: _Command) -> Optional[ParseResult]:
+    if "email" in cmd.lowered:
         return "setup email", None, None
-    
-    if action == "send" and ("email" in user_input.lower() or "mail" in user_input.lower()):
-        if "file" in user_input.lower():
+    return None
+
+@_rule(actions=["send"])
+def _rule_send_email(cmd: _Command) -> Optional[ParseResult]:
+    lowered = cmd.lowered
+    if "email" in lowered or "mail" in lowered:
+        if "file" in lowered:
             return "send file email", None, None
-        elif "template" in user_input.lower():
+        elif "template" in lowered:
             return "send template email", None, None
         else:
             return "send email", None, None
+    return None
+
+# ==================== CROSS-APP WORKFLOWS ====================
+
+_keyword_rule("screenshot share", ("screenshot",), ("share", "upload"))
+
+@_rule("transcribe")
+def _rule_video_transcribe(cmd: _Command) -> Optional[ParseResult]:
+    if "video" not in cmd.lowered:
+        return None
+    # Extract URL if provided
+    url = next((word for word in cmd.tokens if _VIDEO_URL_RE.search(word)), None)
+    return "video transcribe", url, None
+
+_keyword_rule("process invoices", ("invoice",), ("process", "extract"))
+_keyword_rule("monitor pdf", ("monitor", "pdf"), extract=_location_arg)
+
+# ==================== DEVELOPER TOOLS ====================
+
+@_rule("clone")
+def _rule_clone_setup(cmd: _Command) -> Optional[ParseResult]:
+    if "setup" not in cmd.lowered and "repo" not in cmd.lowered:
+        return None
+    # Extract repo URL
+    words = cmd.tokens
+    repo_url = None
+    project_name = None
     
-    if action == "list" and ("templates" in user_input.lower() or "email" in user_input.lower()):
-        return "list email templates", None, None
-    
-    if action == "check" and "email" in user_input.lower():
-        return "email status", None, None
-    
-    # ==================== CROSS-APP WORKFLOWS ====================
-    
-    if "screenshot" in user_input.lower() and ("share" in user_input.lower() or "upload" in user_input.lower()):
-        return "screenshot share", None, None
-    
-    if "video" in user_input.lower() and "transcribe" in user_input.lower():
-        # Extract URL if provided
-        words = user_input.split()
-        url = None
-        for word in words:
-            if "http" in word or "youtube" in word or "youtu.be" in word:
-                url = word
-                break
-        return "video transcribe", url, None
-    
-    if "invoice" in user_input.lower() and ("process" in user_input.lower() or "extract" in user_input.lower()):
-        return "process invoices", None, None
-    
-    if "monitor" in user_input.lower() and "pdf" in user_input.lower():
-        folder = extract_location(user_input)
-        return "monitor pdf", folder, None
-    
-    if action == "run" and "workflow" in user_input.lower():
-        workflow_name = extract_name(user_input, "run")
-        return "run workflow", workflow_name, None
-    
-    if action == "list" and "workflow" in user_input.lower():
-        return "list workflows", None, None
-    
-    # ==================== DEVELOPER TOOLS ====================
-    
-    if "clone" in user_input.lower() and ("setup" in user_input.lower() or "repo" in user_input.lower()):
-        # Extract repo URL
-        words = user_input.split()
-        repo_url = None
-        project_name = None
-        
-        for word in words:
-            if "github.com" in word or "gitlab.com" in word or ".git" in word:
-                repo_url = word
-            elif word not in get_all_reserved_words() and len(word) > 2 and not repo_url:
-                project_name = word
-        
-        return "clone setup", repo_url, project_name
-    
-    if action == "find" and "todo" in user_input.lower():
-        project_path = extract_location(user_input)
-        return "find todos", project_path, None
-    
-    if action == "run" and "test" in user_input.lower():
-        project_path = extract_location(user_input)
-        return "run tests", project_path, None
-    
-    if "commit" in user_input.lower() and "message" in user_input.lower():
-        project_path = extract_location(user_input)
-        return "commit message", project_path, None
-    
-    if "deploy" in user_input.lower() and ("production" in user_input.lower() or "prod" in user_input.lower()):
-        project_path = extract_location(user_input)
-        platform = None
-        if "vercel" in user_input.lower():
-            platform = "vercel"
-        elif "heroku" in user_input.lower():
-            platform = "heroku"
-        elif "netlify" in user_input.lower():
-            platform = "netlify"
-        return "deploy production", project_path, platform
-    
-    if action == "list" and ("project" in user_input.lower() or "repo" in user_input.lower()):
-        return "list projects", None, None
-    
-    if "terminal" in user_input.lower() or "execute" in user_input.lower():
-        # Extract command after "execute" or "terminal"
-        words = user_input.split()
-        if "execute" in words:
-            idx = words.index("execute")
-            if idx + 1 < len(words):
-                command = " ".join(words[idx + 1:])
-                return "execute terminal", command, None
-        elif "terminal" in words:
-            idx = words.index("terminal")
-            if idx + 1 < len(words):
-                command = " ".join(words[idx + 1:])
-                return "execute terminal", command, None
-    
-    # ==================== ADVANCED CONTEXT MEMORY ====================
-    
-    if "what was i doing" in user_input.lower() or "what doing" in user_input.lower():
-        time_ref = "before lunch"  # default
-        if "morning" in user_input.lower():
-            time_ref = "morning"
-        elif "yesterday" in user_input.lower():
-            time_ref = "yesterday"
-        elif "hour" in user_input.lower():
-            time_ref = "hour ago"
-        return "what doing", time_ref, None
-    
-    if "continue where" in user_input.lower() or "continue session" in user_input.lower():
-        return "continue session", None, None
-    
-    if "find" in user_input.lower() and "project" in user_input.lower() and "related" in user_input.lower():
-        project_name = extract_name(user_input, "find")
-        return "find project files", project_name, None
-    
-    if "search entire" in user_input.lower() or "search system" in user_input.lower():
-        query = extract_name(user_input, "search")
-        return "search system", query, None
-    
-    if "context" in user_input.lower() and "summary" in user_input.lower():
-        return "context summary", None, None
-    
-    # ==================== SAFETY NET & UNDO ====================
-    
-    if "undo" in user_input.lower():
-        if "last" in user_input.lower():
-            return "undo last", None, None
-        elif "hour" in user_input.lower():
-            # Extract number of hours
-            words = user_input.split()
-            hours = 1
-            for word in words:
-                if word.isdigit():
-                    hours = int(word)
-                    break
-            return "undo time", hours, None
-        elif "timeline" in user_input.lower():
-            return "undo timeline", None, None
-    
-    if "check" in user_input.lower() and "safe" in user_input.lower():
-        file_path = extract_location(user_input)
-        return "check safety", file_path, None
-    
-    # ==================== CITATION GENERATOR ====================
-    
-    if "citation" in user_input.lower() or "cite" in user_input.lower():
-        if "generate" in user_input.lower() or "create" in user_input.lower():
-            # Extract file path or URL
-            words = user_input.split()
-            source = None
-            style = None
-            
-            for word in words:
-                if word.lower().endswith('.pdf') or word.startswith('http'):
-                    source = word
-                elif word.lower() in ['apa', 'mla', 'chicago', 'harvard', 'ieee']:
-                    style = word.lower()
-            
-            if not source:
-                source = extract_location(user_input)
-            
-            return "generate citation", source, style
-        
-        elif "history" in user_input.lower():
-            return "citation history", None, None
-    
-    # ==================== AUTOMATED DATA ENTRY ====================
-    
-    if "receipt" in user_input.lower() and ("process" in user_input.lower() or "extract" in user_input.lower()):
-        image_path = extract_location(user_input)
-        output_path = None
-        
-        # Check if output path is specified
-        if "to" in user_input.lower():
-            words = user_input.split()
-            to_index = -1
-            for i, word in enumerate(words):
-                if word.lower() == "to":
-                    to_index = i
-                    break
-            
-            if to_index != -1 and to_index + 1 < len(words):
-                output_path = words[to_index + 1]
-        
-        return "process receipt", image_path, output_path
-    
-    if "pdf" in user_input.lower() and "table" in user_input.lower() and ("extract" in user_input.lower() or "convert" in user_input.lower()):
-        pdf_path = extract_location(user_input)
-        output_path = None
-        
-        # Check if output path is specified
-        if "to" in user_input.lower():
-            words = user_input.split()
-            to_index = -1
-            for i, word in enumerate(words):
-                if word.lower() == "to":
-                    to_index = i
-                    break
-            
-            if to_index != -1 and to_index + 1 < len(words):
-                output_path = words[to_index + 1]
-        
-        return "process pdf table", pdf_path, output_path
-    
-    if "business card" in user_input.lower() and ("process" in user_input.lower() or "extract" in user_input.lower()):
-        folder_path = extract_location(user_input)
-        output_path = None
-        
-        # Check if output path is specified
-        if "to" in user_input.lower():
-            words = user_input.split()
-            to_index = -1
-            for i, word in enumerate(words):
-                if word.lower() == "to":
-                    to_index = i
-                    break
-            
-            if to_index != -1 and to_index + 1 < len(words):
-                output_path = words[to_index + 1]
-        
-        return "process business cards", folder_path, output_path
-    
-    if "data" in user_input.lower() and ("history" in user_input.lower() or "processing" in user_input.lower()):
-        return "data processing history", None, None
-    
-    # ==================== PREMIUM SEARCH - FIND MY LOST FILE ====================
-    
-    if "find" in user_input.lower() and ("lost" in user_input.lower() or "missing" in user_input.lower() or "where is" in user_input.lower()):
-        # Extract file description
-        description = user_input.lower()
-        # Remove command words
-        for word in ["find", "lost", "missing", "where", "is", "my", "the"]:
-            description = description.replace(word, "")
-        description = description.strip()
-        
-        return "find lost file", description, None
-    
-    if "find files" in user_input.lower() and ("date" in user_input.lower() or "yesterday" in user_input.lower() or "tuesday" in user_input.lower() or "last week" in user_input.lower()):
-        # Extract date description
-        date_words = ["yesterday", "last tuesday", "last week", "this morning", "last month"]
-        date_desc = None
-        
-        for date_word in date_words:
-            if date_word in user_input.lower():
-                date_desc = date_word
-                break
-        
-        if not date_desc:
-            date_desc = extract_name(user_input, "find")
-        
-        return "find files by date", date_desc, None
-    
-    if "find" in user_input.lower() and ("content" in user_input.lower() or "contains" in user_input.lower() or "mentioned" in user_input.lower()):
-        content_desc = extract_name(user_input, "find")
-        return "find file content", content_desc, None
-    
-    if "index" in user_input.lower() and "files" in user_input.lower():
-        return "index files", None, None
-    
-    # ==================== DISASTER RECOVERY - UNDO DISASTER ====================
-    
-    if "undo" in user_input.lower() and ("disaster" in user_input.lower() or "everything" in user_input.lower() or "last action" in user_input.lower()):
-        return "undo disaster", None, None
-    
-    if "undo" in user_input.lower() and ("from" in user_input.lower() or "minutes" in user_input.lower() or "time" in user_input.lower()):
-        # Extract time period
-        words = user_input.split()
-        minutes = 30  # default
-        
-        for i, word in enumerate(words):
-            if word.isdigit():
-                minutes = int(word)
-                break
-            elif word in ["hour", "hours"]:
-                if i > 0 and words[i-1].isdigit():
-                    minutes = int(words[i-1]) * 60
-                else:
-                    minutes = 60
-                break
-        
-        return "undo from time", str(minutes), None
-    
-    if "disaster" in user_input.lower() and "timeline" in user_input.lower():
-        hours = 24
-        words = user_input.split()
-        for word in words:
-            if word.isdigit():
-                hours = int(word)
-                break
-        
-        return "disaster timeline", str(hours), None
+    for word in words:
+        if _REPO_URL_RE.search(word):
+            repo_url = word
+        elif word not in _RESERVED and len(word) > 2 and not repo_url:
+            project_name = word
     
-    if "find" in user_input.lower() and "deleted" in user_input.lower():
-        days = 7
-        words = user_input.split()
-        for word in words:
-            if word.isdigit():
-                days = int(word)
-                break
+    return "clone setup", repo_url, project_name
+
+_keyword_rule("commit message", ("commit", "message"), extract=_location_arg)
+
+@_rule("deploy")
+def _rule_deploy_production(cmd: _Command) -> Optional[ParseResult]:
+    lowered = cmd.lowered
+    if "production" not in lowered and "prod" not in lowered:
+        return None
+    project_path = extract_location(lowered)
+    platform = None
+    if "vercel" in lowered:
+        platform = "vercel"
+    elif "heroku" in lowered:
+        platform = "heroku"
+    elif "netlify" in lowered:
+        platform = "netlify"
+    return "deploy production", project_path, platform
+
+@_rule("terminal", "execute")
+def _rule_execute_terminal(cmd: _Command) -> Optional[ParseResult]:
+    # Extract command after "execute" or "terminal"
+    words = cmd.tokens
+    if "execute" in words:
+        idx = words.index("execute")
+        if idx + 1 < len(words):
+            command = " ".join(words[idx + 1:])
+            return "execute terminal", command, None
+    elif "terminal" in words:
+        idx = words.index("terminal")
+        if idx + 1 < len(words):
+            command = " ".join(words[idx + 1:])
+            return "execute terminal", command, None
+    return None
+
+# ==================== ADVANCED CONTEXT MEMORY ====================
+
+@_rule("what was i doing", "what doing")
+def _rule_what_doing(cmd: _Command) -> Optional[ParseResult]:
+    lowered = cmd.lowered
+    time_ref = "before lunch"  # default
+    if "morning" in lowered:
+        time_ref = "morning"
+    elif "yesterday" in lowered:
+        time_ref = "yesterday"
+    elif "hour" in lowered:
+        time_ref = "hour ago"
+    return "what doing", time_ref, None
+
+_keyword_rule("continue session", any_of=("continue where", "continue session"))
+_keyword_rule("find project files", ("related", "project", "find"), extract=_name_arg("find"))
+_keyword_rule("search system", any_of=("search entire", "search system"), extract=_name_arg("search"))
+_keyword_rule("context summary", ("context", "summary"))
+
+# ==================== SAFETY NET & UNDO ====================
+
+@_rule("undo")
+def _rule_undo(cmd: _Command) -> Optional[ParseResult]:
+    lowered = cmd.lowered
+    if "last" in lowered:
+        return "undo last", None, None
+    elif "hour" in lowered:
+        # Extract number of hours
+        return "undo time", _first_int(lowered, 1), None
+    elif "timeline" in lowered:
+        return "undo timeline", None, None
+    return None
+
+_keyword_rule("check safety", ("safe", "check"), extract=_location_arg)
+
+# ==================== CITATION GENERATOR ====================
+
+@_rule("citation", "cite")
+def _rule_citation(cmd: _Command) -> Optional[ParseResult]:
+    lowered = cmd.lowered
+    if "generate" in lowered or "create" in lowered:
+        # Extract file path or URL
+        words = cmd.tokens
+        source = None
+        style = None
         
-        return "find deleted files", str(days), None
-    
-    if "create" in user_input.lower() and "checkpoint" in user_input.lower():
-        description = extract_name(user_input, "create")
-        return "create checkpoint", description, None
-    
-    if "recovery" in user_input.lower() and ("stats" in user_input.lower() or "statistics" in user_input.lower()):
-        return "recovery stats", None, None
-    
-    # ==================== DUPLICATE DESTROYER - RECLAIM STORAGE ====================
-    
-    if "scan" in user_input.lower() and "duplicate" in user_input.lower():
-        return "scan duplicates", None, None
-    
-    if "show" in user_input.lower() and "duplicate" in user_input.lower():
-        limit = 10
-        words = user_input.split()
-        for word in words:
-            if word.isdigit():
-                limit = int(word)
-                break
+        for word, word_low in zip(words, cmd.tokens_low):
+            if word_low.endswith('.pdf') or word.startswith('http'):
+                source = word
+            elif word_low in _CITATION_STYLES:
+                style = word_low
         
-        return "show duplicates", str(limit), None
-    
-    if "delete" in user_input.lower() and "duplicate" in user_input.lower():
-        strategy = "newest"  # default
-        if "oldest" in user_input.lower():
-            strategy = "oldest"
-        elif "shortest" in user_input.lower():
-            strategy = "shortest_path"
+        if not source:
+            source = extract_location(lowered)
         
-        return "delete duplicates", strategy, None
-    
-    if "duplicate" in user_input.lower() and "download" in user_input.lower():
-        return "duplicate downloads", None, None
+        return "generate citation", source, style
     
-    if "duplicate" in user_input.lower() and ("photo" in user_input.lower() or "image" in user_input.lower()):
-        return "duplicate photos", None, None
-    
-    if "storage" in user_input.lower() and ("analysis" in user_input.lower() or "analyze" in user_input.lower()):
-        return "storage analysis", None, None
-    
-    # ==================== SYSTEM OPTIMIZER - FIX MY SLOW COMPUTER ====================
-    
-    if "diagnose" in user_input.lower() or ("why" in user_input.lower() and "slow" in user_input.lower()):
+    elif "history" in lowered:
+        return "citation history", None, None
+    return None
+
+# ==================== AUTOMATED DATA ENTRY ====================
+
+@_rule("receipt")
+def _rule_process_receipt(cmd: _Command) -> Optional[ParseResult]:
+    lowered = cmd.lowered
+    if "process" not in lowered and "extract" not in lowered:
+        return None
+    image_path = extract_location(lowered)
+    # Output path, if specified
+    output_path = _extract_after(cmd.tokens, cmd.token_index, "to")
+    
+    return "process receipt", image_path, output_path
+
+@_rule("table")
+def _rule_process_pdf_table(cmd: _Command) -> Optional[ParseResult]:
+    lowered = cmd.lowered
+    if "pdf" not in lowered or ("extract" not in lowered and "convert" not in lowered):
+        return None
+    pdf_path = extract_location(lowered)
+    # Output path, if specified
+    output_path = _extract_after(cmd.tokens, cmd.token_index, "to")
+    
+    return "process pdf table", pdf_path, output_path
+
+@_rule("business card")
+def _rule_process_business_cards(cmd: _Command) -> Optional[ParseResult]:
+    lowered = cmd.lowered
+    if "process" not in lowered and "extract" not in lowered:
+        return None
+    folder_path = extract_location(lowered)
+    # Output path, if specified
+    output_path = _extract_after(cmd.tokens, cmd.token_index, "to")
+    
+    return "process business cards", folder_path, output_path
+
+_keyword_rule("data processing history", ("data",), ("history", "processing"))
+
+# ==================== PREMIUM SEARCH - FIND MY LOST FILE ====================
+
+@_rule("lost", "missing", "where is")
+def _rule_find_lost_file(cmd: _Command) -> Optional[ParseResult]:
+    if "find" not in cmd.lowered:
+        return None
+    # Extract file description
+    description = cmd.lowered
+    # Remove command words
+    for word in ["find", "lost", "missing", "where", "is", "my", "the"]:
+        description = description.replace(word, "")
+    description = description.strip()
+    
+    return "find lost file", description, None
+
+@_rule("find files")
+def _rule_find_files_by_date(cmd: _Command) -> Optional[ParseResult]:
+    lowered = cmd.lowered
+    if not ("date" in lowered or "yesterday" in lowered or "tuesday" in lowered or "last week" in lowered):
+        return None
+    # Extract date description
+    date_desc = next((date_word for date_word in _DATE_WORDS if date_word in lowered), None)
+    
+    if not date_desc:
+        date_desc = extract_name(lowered, "find")
+    
+    return "find files by date", date_desc, None
+
+_keyword_rule("find file content", ("find",), ("content", "contains", "mentioned"),
+              extract=_name_arg("find"))
+_keyword_rule("index files", ("index", "files"))
+
+# ==================== DISASTER RECOVERY - UNDO DISASTER ====================
+
+_keyword_rule("undo disaster", ("undo",), ("disaster", "everything", "last action"))
+
+@_rule("undo")
+def _rule_undo_from_time(cmd: _Command) -> Optional[ParseResult]:
+    lowered = cmd.lowered
+    if not ("from" in lowered or "minutes" in lowered or "time" in lowered):
+        return None
+    # Extract time period; commands mentioning hours were taken by _rule_undo
+    minutes = _first_int(lowered, 30)
+    return "undo from time", str(minutes), None
+
+_keyword_rule("disaster timeline", ("disaster", "timeline"),
+              extract=lambda cmd: (str(_first_int(cmd.lowered, 24)), None))
+_keyword_rule("find deleted files", ("deleted", "find"),
+              extract=lambda cmd: (str(_first_int(cmd.lowered, 7)), None))
+_keyword_rule("create checkpoint", ("checkpoint", "create"), extract=_name_arg("create"))
+_keyword_rule("recovery stats", ("recovery",), ("stats", "statistics"))
+
+# ==================== DUPLICATE DESTROYER - RECLAIM STORAGE ====================
+
+_keyword_rule("scan duplicates", ("duplicate", "scan"))
+_keyword_rule("show duplicates", ("duplicate", "show"),
+              extract=lambda cmd: (str(_first_int(cmd.lowered, 10)), None))
+
+@_rule("duplicate")
+def _rule_delete_duplicates(cmd: _Command) -> Optional[ParseResult]:
+    lowered = cmd.lowered
+    if "delete" not in lowered:
+        return None
+    strategy = "newest"  # default
+    if "oldest" in lowered:
+        strategy = "oldest"
+    elif "shortest" in lowered:
+        strategy = "shortest_path"
+    
+    return "delete duplicates", strategy, None
+
+_keyword_rule("duplicate downloads", ("duplicate", "download"))
+_keyword_rule("duplicate photos", ("duplicate",), ("photo", "image"))
+_keyword_rule("storage analysis", ("storage",), ("analysis", "analyze"))
+
+# ==================== SYSTEM OPTIMIZER - FIX MY SLOW COMPUTER ====================
+
+@_rule("diagnose", "slow")
+def _rule_diagnose_computer(cmd: _Command) -> Optional[ParseResult]:
+    if "diagnose" in cmd.lowered or "why" in cmd.lowered:
         return "diagnose computer", None, None
+    return None
+
+_keyword_rule("fix computer", ("fix",), ("computer", "everything", "slow"))
+_keyword_rule("performance report", ("performance", "report"))
+_keyword_rule("optimization history", ("optimization", "history"))
+
+# ==================== FILE ENCRYPTION BUTLER - PREMIUM SECURITY ====================
+
+@_rule("lock")
+def _rule_lock_folder(cmd: _Command) -> Optional[ParseResult]:
+    lowered = cmd.lowered
+    if "folder" not in lowered:
+        return None
+    # Extract folder path and password
+    folder_path = extract_location(lowered)
+    
+    # For security, password should be prompted separately in production
+    # For demo, we'll extract from command if provided
+    password = _extract_after(cmd.tokens, cmd.token_index, "password")
+    
+    return "lock folder", folder_path, password
+
+@_rule("vault", "secure")
+def _rule_create_vault(cmd: _Command) -> Optional[ParseResult]:
+    lowered = cmd.lowered
+    if "create" not in lowered:
+        return None
+    vault_name = extract_name(lowered, "create")
     
-    if "fix" in user_input.lower() and ("computer" in user_input.lower() or "everything" in user_input.lower() or "slow" in user_input.lower()):
-        return "fix computer", None, None
-    
-    if "performance" in user_input.lower() and "report" in user_input.lower():
-        return "performance report", None, None
-    
-    if "optimization" in user_input.lower() and "history" in user_input.lower():
-        return "optimization history", None, None
-    
-    # ==================== FILE ENCRYPTION BUTLER - PREMIUM SECURITY ====================
+    # Extract password if provided
+    password = _extract_after(cmd.tokens, cmd.token_index, "password")
     
-    if "lock" in user_input.lower() and "folder" in user_input.lower():
-        # Extract folder path and password
-        folder_path = extract_location(user_input)
-        
-        # For security, password should be prompted separately in production
-        # For demo, we'll extract from command if provided
-        words = user_input.split()
-        password = None
-        
-        # Look for password after "password" keyword
-        if "password" in user_input.lower():
-            password_index = -1
-            for i, word in enumerate(words):
-                if word.lower() == "password":
-                    password_index = i
-                    break
-            
-            if password_index != -1 and password_index + 1 < len(words):
-                password = words[password_index + 1]
-        
-        return "lock folder", folder_path, password
+    return "create vault", vault_name, password
+
+@_rule("vault")
+def _rule_unlock_vault(cmd: _Command) -> Optional[ParseResult]:
+    lowered = cmd.lowered
+    if "unlock" not in lowered:
+        return None
+    vault_name = extract_name(lowered, "unlock")
     
-    if "create" in user_input.lower() and ("vault" in user_input.lower() or "secure" in user_input.lower()):
-        vault_name = extract_name(user_input, "create")
-        
-        # Extract password if provided
-        words = user_input.split()
-        password = None
-        
-        if "password" in user_input.lower():
-            password_index = -1
-            for i, word in enumerate(words):
-                if word.lower() == "password":
-                    password_index = i
-                    break
-            
-            if password_index != -1 and password_index + 1 < len(words):
-                password = words[password_index + 1]
-        
-        return "create vault", vault_name, password
+    # Extract password if provided
+    password = _extract_after(cmd.tokens, cmd.token_index, "password")
     
-    if "unlock" in user_input.lower() and "vault" in user_input.lower():
-        vault_name = extract_name(user_input, "unlock")
-        
-        # Extract password if provided
-        words = user_input.split()
-        password = None
-        
-        if "password" in user_input.lower():
-            password_index = -1
-            for i, word in enumerate(words):
-                if word.lower() == "password":
-                    password_index = i
-                    break
-            
-            if password_index != -1 and password_index + 1 < len(words):
-                password = words[password_index + 1]
-        
-        return "unlock vault", vault_name, password
-    
-    if "add" in user_input.lower() and "vault" in user_input.lower():
-        file_path = extract_location(user_input)
-        vault_name = extract_name(user_input, "vault")
-        
-        return "add to vault", file_path, vault_name
+    return "unlock vault", vault_name, password
+
+_keyword_rule("add to vault", ("vault", "add"),
+              extract=lambda cmd: (extract_location(cmd.lowered), extract_name(cmd.lowered, "vault")))
+_keyword_rule("list vaults", ("list",), ("vault", "secure"))
+_keyword_rule("encryption stats", ("encryption",), ("stats", "statistics"))
+_keyword_rule("auto encrypt", ("encrypt", "auto"))
+
+def _build_keyword_index() -> Tuple[Any, Dict[str, List[int]]]:
+    """One pattern finding every rule keyword in a command, and the rules to
+    try for each match"""
+    keywords = sorted(_RULES_BY_KEYWORD, key=len, reverse=True)
+    # A match also stands for the keywords it starts with ("encryption" for
+    # "encrypt"), which the pattern reports as the longer one
+    rules_by_match = {
+        keyword: sorted({index for prefix in keywords if keyword.startswith(prefix)
+                         for index in _RULES_BY_KEYWORD[prefix]})
+        for keyword in keywords
+    }
+    return re.compile("(?=(%s))" % _alternation(keywords)), rules_by_match
+
+_RULE_KEYWORDS_RE, _RULES_BY_MATCH = _build_keyword_index()
+
+def _match_tail_rules(action: str, cmd: _Command) -> ParseResult:
+    """Try the rules whose keywords or action occur in the command, in order"""
+    candidates = set(_RULES_BY_ACTION.get(action, ()))
+    for keyword in _RULE_KEYWORDS_RE.findall(cmd.lowered):
+        candidates.update(_RULES_BY_MATCH[keyword])
+    for index in sorted(candidates):
+        result = _RULES[index](cmd)
+        if result is not None:
+            return result
+    return None, None, None
+
+# parse_command is a pure function of its input and returns immutable
+# tuples, so whole results are cached; repeated commands skip every stage
+@functools.lru_cache(maxsize=1024)
+def parse_command(user_input: str) -> ParseResult:
+    """
+    Parse user input and detect intent with comprehensive command support
+    """
+    if not user_input.strip():
+        return None, None, None
     
-    if "list" in user_input.lower() and ("vault" in user_input.lower() or "secure" in user_input.lower()):
-        return "list vaults", None, None
+    # Lowercased and whitespace-normalized once; the matchers and extractors
+    # all expect text in this form
+    lowered = " ".join(user_input.lower().split())
     
-    if "encryption" in user_input.lower() and ("stats" in user_input.lower() or "statistics" in user_input.lower()):
-        return "encryption stats", None, None
+    # Find the action using preprocessed input
+    action = find_best_action(lowered)
+    if not action:
+        return None, None, None
     
-    if "auto" in user_input.lower() and ("encrypt" in user_input.lower() or "encryption" in user_input.lower()):
-        return "auto encrypt", None, None
+    parser = _ACTION_PARSERS.get(action)
+    if parser:
+        return parser(lowered)
     
-    return None, None, None
\ No newline at end of file
+    return _match_tail_rules(action, _Command(user_input, lowered))
@@ -4,20 +4,34 @@ Notification System for Linux Desktop AI Agent
 Handles desktop notifications, alerts, and logging
 """
 
+import os
+import ctypes
+import ctypes.util
 import subprocess
 import logging
 import smtplib
-from typing import Optional, List
-from enum import Enum
+import threading
+import time
+from collections import deque
+from itertools import islice
+from typing import Deque, Dict, Optional, List
+from enum import IntEnum
 from datetime import datetime
 from pathlib import Path
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
+try:
+    from jeepney import DBusAddress, MessageType, new_method_call
+    from jeepney.io.blocking import open_dbus_connection
+    JEEPNEY_AVAILABLE = True
+except ImportError:
+    JEEPNEY_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
-class NotificationPriority(Enum):
+class NotificationPriority(IntEnum):
     """Notification priority levels"""
     LOW = 0
     NORMAL = 1
@@ -25,6 +39,19 @@ class NotificationPriority(Enum):
     CRITICAL = 3
 
 
+_SOUND_DIR = "/usr/share/sounds/freedesktop/stereo"
+
+# Per-priority settings, indexed by NotificationPriority
+_URGENCY = ("low", "normal", "critical", "critical")  # notify-send -u
+_DBUS_URGENCY = (0, 1, 2, 2)  # org.freedesktop.Notifications urgency hint
+_SOUND = (
+    f"{_SOUND_DIR}/complete.oga",
+    f"{_SOUND_DIR}/complete.oga",
+    f"{_SOUND_DIR}/alarm-clock-elapsed.oga",
+    f"{_SOUND_DIR}/alarm-clock-elapsed.oga"
+)
+
+
 class NotificationSystem:
     """
     Notification system for desktop alerts
@@ -43,8 +70,19 @@ class NotificationSystem:
         self.notification_type = self.config.get("notification_type", "desktop")
         self.email_address = self.config.get("email_address")
         
-        self.notification_history: List[dict] = []
         self.max_history = 100
+        # Bounded, so the oldest entry drops off as a new one arrives
+        self.notification_history: Deque[dict] = deque(maxlen=self.max_history)
+        
+        # Session bus connection, opened on first notification and reused;
+        # notify-send is only spawned when D-Bus can't be used
+        self._dbus_connection = None
+        self._dbus_usable = JEEPNEY_AVAILABLE
+        self._dbus_lock = threading.Lock()
+        # libcanberra (library, context) for in-process sounds; None until
+        # the first sound, False if it can't be used
+        self._canberra = None
+        self._canberra_lock = threading.Lock()
     
     def notify(self, title: str, message: str, 
                priority: NotificationPriority = NotificationPriority.NORMAL,
@@ -87,30 +125,29 @@ class NotificationSystem:
                                    priority: NotificationPriority) -> bool:
         """Send desktop notification using notify-send"""
         try:
-            urgency_map = {
-                NotificationPriority.LOW: "low",
-                NotificationPriority.NORMAL: "normal",
-                NotificationPriority.HIGH: "critical",
-                NotificationPriority.CRITICAL: "critical"
-            }
-            
-            urgency = urgency_map.get(priority, "normal")
+            if self._dbus_usable and self._send_dbus_notification(title, message, priority):
+                logger.info("Desktop notification sent: %s", title)
+                return True
             
             cmd = [
                 "notify-send",
-                "-u", urgency,
+                "-u", _URGENCY[priority],
                 "-t", "5000",
                 title,
                 message
             ]
             
-            result = subprocess.run(cmd, capture_output=True, timeout=10)
+            # Only stderr is read, and only for the failure message
+            result = subprocess.run(cmd, stdout=subprocess.DEVNULL,
+                                    stderr=subprocess.PIPE, timeout=10)
             
             if result.returncode == 0:
-                logger.info(f"Desktop notification sent: {title}")
+                logger.info("Desktop notification sent: %s", title)
                 return True
             else:
-                logger.warning(f"Failed to send desktop notification: {result.stderr.decode()}")
+                if logger.isEnabledFor(logging.WARNING):
+                    logger.warning("Failed to send desktop notification: %s",
+                                   result.stderr.decode("utf-8", "replace"))
                 return False
         except FileNotFoundError:
             logger.warning("notify-send not found. Install with: sudo apt install libnotify-bin")
@@ -119,6 +156,38 @@ class NotificationSystem:
             logger.error(f"Error sending desktop notification: {e}")
             return False
     
+    def _send_dbus_notification(self, title: str, message: str,
+                                priority: NotificationPriority) -> bool:
+        """Send notification over the session bus; False if it didn't go out"""
+        address = DBusAddress("/org/freedesktop/Notifications",
+                              bus_name="org.freedesktop.Notifications",
+                              interface="org.freedesktop.Notifications")
+        msg = new_method_call(address, "Notify", "susssasa{sv}i", (
+            "Desktop AI Agent", 0, "", title, message, [],
+            {"urgency": ("y", _DBUS_URGENCY[priority])}, 5000
+        ))
+        with self._dbus_lock:
+            if self._dbus_connection is None:
+                try:
+                    self._dbus_connection = open_dbus_connection(bus="SESSION")
+                except Exception as e:
+                    # No session bus (e.g. headless); stop trying
+                    logger.debug(f"D-Bus unavailable, using notify-send: {e}")
+                    self._dbus_usable = False
+                    return False
+            try:
+                reply = self._dbus_connection.send_and_get_reply(msg, timeout=10)
+            except Exception as e:
+                # Drop the connection; the next notification reconnects
+                logger.debug(f"D-Bus notification failed: {e}")
+                try:
+                    self._dbus_connection.close()
+                except Exception:
+                    pass
+                self._dbus_connection = None
+                return False
+        return reply.header.message_type != MessageType.error
+    
     def _send_email_notification(self, title: str, message: str,
                                 priority: NotificationPriority):
         """Send email notification"""
@@ -134,25 +203,44 @@ class NotificationSystem:
         try:
             sound_file = self._get_sound_file(priority)
             
+            if self._play_canberra_sound(sound_file):
+                return
+            
             # Try to play with paplay
             subprocess.run(
                 ["paplay", sound_file],
-                capture_output=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
                 timeout=5
             )
         except Exception as e:
             logger.debug(f"Could not play sound: {e}")
     
+    def _play_canberra_sound(self, sound_file: str) -> bool:
+        """Play a sound through libcanberra without spawning a player;
+        False if it didn't start"""
+        with self._canberra_lock:
+            if self._canberra is None:
+                self._canberra = False
+                library = ctypes.util.find_library("canberra")
+                if library:
+                    try:
+                        lib = ctypes.CDLL(library)
+                        context = ctypes.c_void_p()
+                        if lib.ca_context_create(ctypes.byref(context)) == 0:
+                            self._canberra = (lib, context)
+                    except OSError as e:
+                        logger.debug(f"Could not load libcanberra: {e}")
+            if not self._canberra:
+                return False
+            lib, context = self._canberra
+            # Playback is asynchronous; the property list ends with NULL
+            return lib.ca_context_play(context, 0, b"media.filename",
+                                       os.fsencode(sound_file), None) == 0
+    
     def _get_sound_file(self, priority: NotificationPriority) -> str:
         """Get sound file for priority"""
-        sound_map = {
-            NotificationPriority.LOW: "/usr/share/sounds/freedesktop/stereo/complete.oga",
-            NotificationPriority.NORMAL: "/usr/share/sounds/freedesktop/stereo/complete.oga",
-            NotificationPriority.HIGH: "/usr/share/sounds/freedesktop/stereo/alarm-clock-elapsed.oga",
-            NotificationPriority.CRITICAL: "/usr/share/sounds/freedesktop/stereo/alarm-clock-elapsed.oga"
-        }
-        
-        return sound_map.get(priority, "/usr/share/sounds/freedesktop/stereo/complete.oga")
+        return _SOUND[priority]
     
     def _add_to_history(self, title: str, message: str, priority: NotificationPriority):
         """Add notification to history"""
@@ -164,14 +252,11 @@ class NotificationSystem:
         }
         
         self.notification_history.append(notification)
-        
-        # Keep history size limited
-        if len(self.notification_history) > self.max_history:
-            self.notification_history = self.notification_history[-self.max_history:]
     
     def get_history(self, limit: int = 20) -> List[dict]:
         """Get notification history"""
-        return self.notification_history[-limit:]
+        history = self.notification_history
+        return list(islice(history, max(0, len(history) - limit), None))
     
     def clear_history(self):
         """Clear notification history"""
@@ -195,39 +280,54 @@ class AlertManager:
         self.cpu_threshold = self.config.get("cpu_threshold", 80.0)
         self.memory_threshold = self.config.get("memory_threshold", 80.0)
         self.disk_threshold = self.config.get("disk_threshold", 85.0)
+        # Seconds before the same alert is shown again while its condition persists
+        self.alert_cooldown = self.config.get("alert_cooldown", 300)
         
         self.alert_history = {}
+        self._last_alert_time: Dict[str, float] = {}
+    
+    def _cooled_down(self, key: str) -> bool:
+        """True if alert `key` may be shown now; records it as shown"""
+        now = time.monotonic()
+        last = self._last_alert_time.get(key)
+        if last is not None and now - last < self.alert_cooldown:
+            return False
+        self._last_alert_time[key] = now
+        return True
     
     def check_cpu(self, cpu_usage: float) -> bool:
         """Check CPU usage and alert if needed"""
         if cpu_usage > self.cpu_threshold:
-            self.notification_system.notify(
-                "High CPU Usage",
-                f"CPU usage is {cpu_usage:.1f}%",
-                NotificationPriority.HIGH
-            )
+            if self._cooled_down("cpu"):
+                self.notification_system.notify(
+                    "High CPU Usage",
+                    f"CPU usage is {cpu_usage:.1f}%",
+                    NotificationPriority.HIGH
+                )
             return True
         return False
     
     def check_memory(self, memory_usage: float) -> bool:
         """Check memory usage and alert if needed"""
         if memory_usage > self.memory_threshold:
-            self.notification_system.notify(
-                "High Memory Usage",
-                f"Memory usage is {memory_usage:.1f}%",
-                NotificationPriority.HIGH
-            )
+            if self._cooled_down("memory"):
+                self.notification_system.notify(
+                    "High Memory Usage",
+                    f"Memory usage is {memory_usage:.1f}%",
+                    NotificationPriority.HIGH
+                )
             return True
         return False
     
     def check_disk(self, disk_usage: float) -> bool:
         """Check disk usage and alert if needed"""
         if disk_usage > self.disk_threshold:
-            self.notification_system.notify(
-                "Disk Space Low",
-                f"Disk usage is {disk_usage:.1f}%",
-                NotificationPriority.CRITICAL
-            )
+            if self._cooled_down("disk"):
+                self.notification_system.notify(
+                    "Disk Space Low",
+                    f"Disk usage is {disk_usage:.1f}%",
+                    NotificationPriority.CRITICAL
+                )
             return True
         return False
     
@@ -244,11 +344,12 @@ class AlertManager:
     def check_update_available(self, package_count: int) -> bool:
         """Alert on available updates"""
         if package_count > 0:
-            self.notification_system.notify(
-                "Updates Available",
-                f"{package_count} package updates available",
-                NotificationPriority.NORMAL
-            )
+            if self._cooled_down("updates"):
+                self.notification_system.notify(
+                    "Updates Available",
+                    f"{package_count} package updates available",
+                    NotificationPriority.NORMAL
+                )
             return True
         return False
 
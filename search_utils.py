@@ -50,7 +50,7 @@ def find_files_by_name(name: str, root_paths: List[str] = None, max_results: int
             try:
                 # Skip hidden and some system folders in Unix
                 # For Windows, skip Recycle Bin like directories starting with '$'
-                dirs[:] = [d for d in dirs if not d.startswith('.') and not d.startswith('$')]
+                dirs[:] = [d for d in dirs if not d.startswith(('.', '$'))]
             except Exception:
                 pass
 
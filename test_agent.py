@@ -4,9 +4,15 @@ Test suite for Linux Desktop AI Agent
 """
 
 import sys
+import os
+import random
 import logging
+import tempfile
 from linux_desktop_agent import LinuxDesktopAgent
 from module_framework import ResultStatus
+from file_manager_module import FileManagerModule
+import nlp_parser
+from nlp_parser import parse_command
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -186,6 +192,212 @@ class AgentTester:
             self.failed += 1
             return False
     
+    def test_fuzzy_matching(self):
+        """Test that the parser's matchers agree with fuzzywuzzy"""
+        print("\n" + "="*60)
+        print("FUZZY MATCHING TEST")
+        print("="*60)
+        
+        try:
+            from fuzzywuzzy import fuzz, process
+        except ImportError:
+            print("SKIPPED: fuzzywuzzy not installed")
+            return
+        
+        # Punctuation and near misses around the cutoff are where
+        # processing and score rounding make a difference
+        commands = [
+            "delete, the file.", "it's in my folder!", "open the foldr",
+            "check batery and wifi.", "chrome, tabs", "open the documnet",
+            "report.pdf please", "launch calculater", "spotfy", "e-mail it",
+            "atachment template", "set my wallpapr", "docs", "wrd", "fiel",
+        ]
+        
+        def by_word(words, lowered):
+            for word in lowered.split():
+                best = process.extractOne(word, words, scorer=fuzz.ratio)
+                if best and best[1] >= 70:
+                    return best[0]
+            return None
+        
+        def by_text(words, lowered):
+            best = process.extractOne(lowered, words, scorer=fuzz.partial_ratio)
+            return best[0] if best and best[1] > 70 else None
+        
+        checks = [
+            (nlp_parser.find_target_word, lambda c: by_word(nlp_parser.TARGET_WORDS, c) is not None),
+            (nlp_parser.find_system_word, lambda c: by_word(nlp_parser.SYSTEM_WORDS, c)),
+            (nlp_parser.find_browser_word, lambda c: by_word(nlp_parser.BROWSER_WORDS, c)),
+            (nlp_parser.find_document_word, lambda c: by_text(nlp_parser.DOCUMENT_WORDS, c)),
+            (nlp_parser.find_app_word, lambda c: by_text(nlp_parser.APP_WORDS, c)),
+            (nlp_parser.find_file_op_word, lambda c: by_text(nlp_parser.FILE_OP_WORDS, c)),
+            (nlp_parser.find_personal_word, lambda c: by_text(nlp_parser.PERSONAL_WORDS, c)),
+            (nlp_parser.find_email_word, lambda c: by_text(nlp_parser.EMAIL_WORDS, c)),
+        ]
+        
+        mismatches = [(find.__name__, command, find(command), expected(command))
+                      for command in commands for find, expected in checks
+                      if find(command) != expected(command)]
+        
+        if not mismatches:
+            print(f"✓ PASSED: {len(commands) * len(checks)} matches agree with fuzzywuzzy")
+            self.passed += 1
+        else:
+            for name, command, got, expected in mismatches:
+                print(f"❌ FAILED: {name}({command!r}) -> {got!r}, fuzzywuzzy: {expected!r}")
+            self.failed += 1
+    
+    def test_command_parser(self):
+        """Test that destructive commands need their exact verb"""
+        print("\n" + "="*60)
+        print("COMMAND PARSER TEST")
+        print("="*60)
+        
+        def destructive(parsed):
+            return parsed[0] is not None and (parsed[0].startswith("delete")
+                                              or parsed[0] in ("shutdown", "restart"))
+        
+        # None: anything but a delete, shutdown or restart
+        cases = [
+            ("restore deleted files", None),
+            ("move report.txt to documents", None),
+            ("crete folder reboot", ("create folder", "reboot", None)),
+            ("crete folder report.pdf", ("create folder", "report", None)),
+            ("serch notes.pdf", ("search files", "notes.pdf", False)),
+            ("serach restart", None),
+            ("restart the browser", None),
+            ("restart my wifi", None),
+            ("reset my password", None),
+            ("reset brightness", None),
+            ("result of search", None),
+            ("delete file notes.txt", ("delete file", "notes.txt", None)),
+            ("shutdown", ("shutdown", 0, None)),
+            ("power off", ("shutdown", 0, None)),
+            ("reboot", ("restart", 0, None)),
+            ("rebooting the system", ("restart", 0, None)),
+            ("restart my computer in 10", ("restart", 10, None)),
+        ]
+        
+        for command, expected in cases:
+            parsed = parse_command(command)
+            if expected is None:
+                ok = not destructive(parsed)
+            else:
+                ok = parsed == expected
+            
+            if ok:
+                print(f"✓ PASSED: {command!r} -> {parsed}")
+                self.passed += 1
+            else:
+                print(f"❌ FAILED: {command!r} -> {parsed}, expected {expected}")
+                self.failed += 1
+    
+    def test_action_matching(self):
+        """Test find_best_action against the original per-action loop"""
+        print("\n" + "="*60)
+        print("ACTION MATCHING TEST")
+        print("="*60)
+        
+        try:
+            from fuzzywuzzy import fuzz, process
+        except ImportError:
+            print("SKIPPED: fuzzywuzzy not installed")
+            return
+        
+        destructive = ("delete", "shutdown", "restart")
+        
+        def original(command):
+            # find_best_action before the synonym table, without its
+            # where/speed/screenshot shortcuts
+            for action, synonyms in nlp_parser.ACTION_WORDS.items():
+                for word in nlp_parser.preprocess_natural_language(command).split():
+                    best = process.extractOne(word, synonyms, scorer=fuzz.ratio)
+                    if best and best[1] >= 70:
+                        return action
+            return None
+        
+        def exact_verb(command, action):
+            return any(word.strip(",.!?") in (synonym, synonym + "ing")
+                       for word in command.split()
+                       for synonym in nlp_parser.ACTION_WORDS[action])
+        
+        # Synonyms, typos of them and other words, a few with punctuation
+        rng = random.Random(0)
+        synonyms = [s for words in nlp_parser.ACTION_WORDS.values() for s in words]
+        others = ["files", "folder", "my", "the", "report.pdf", "notes", "deleted",
+                  "restore", "result", "password", "wifi", "browser", "computer"]
+        
+        def word():
+            w = rng.choice(synonyms if rng.random() < 0.5 else others)
+            if rng.random() < 0.3 and len(w) > 3:
+                i = rng.randrange(len(w))
+                w = w[:i] + w[i + 1:]
+            return w + rng.choice(["", "", "", "", ",", "."])
+        
+        commands = {" ".join(word() for _ in range(rng.randint(1, 4))) for _ in range(1000)}
+        commands = [c for c in commands if not any(
+            phrase in c for phrase in ("where", "speed", "screenshot", "capture screen", "power"))]
+        
+        # Only a destructive action reached without its verb may change,
+        # and never to another destructive action than the original's
+        failures = []
+        for command in commands:
+            old, new = original(command), nlp_parser.find_best_action(command)
+            if new == old:
+                continue
+            if old not in destructive or exact_verb(command, old) or (
+                    new in destructive and not exact_verb(command, new)):
+                failures.append((command, old, new))
+        
+        if not failures:
+            print(f"✓ PASSED: {len(commands)} commands only lose typo-matched destructive actions")
+            self.passed += 1
+        else:
+            for command, old, new in failures[:10]:
+                print(f"❌ FAILED: {command!r} -> {new!r}, originally {old!r}")
+            self.failed += 1
+    
+    def test_batch_rename(self):
+        """Test batch rename renumbering and its overwrite check"""
+        print("\n" + "="*60)
+        print("BATCH RENAME TEST")
+        print("="*60)
+        
+        module = FileManagerModule()
+        failures = []
+        
+        with tempfile.TemporaryDirectory() as directory:
+            # Renumbering onto names the batch itself frees up
+            for name in ("1.txt", "2.txt", "3.txt"):
+                with open(os.path.join(directory, name), "w") as f:
+                    f.write(name)
+            result = module.execute("batch_rename", {"path": directory, "pattern": "", "start": 2})
+            contents = {}
+            for name in os.listdir(directory):
+                with open(os.path.join(directory, name)) as f:
+                    contents[name] = f.read()
+            if result.status != ResultStatus.SUCCESS or contents != {
+                    "2.txt": "1.txt", "3.txt": "2.txt", "4.txt": "3.txt"}:
+                failures.append(f"renumbering left {contents}")
+        
+        with tempfile.TemporaryDirectory() as directory:
+            # A folder named like a target is not renamed, so it must block
+            os.mkdir(os.path.join(directory, "file_2.txt"))
+            for name in ("a.txt", "b.txt"):
+                open(os.path.join(directory, name), "w").close()
+            result = module.execute("batch_rename", {"path": directory})
+            if result.status != ResultStatus.FAILED or sorted(os.listdir(directory)) != [
+                    "a.txt", "b.txt", "file_2.txt"]:
+                failures.append(f"conflict left {sorted(os.listdir(directory))}")
+        
+        if not failures:
+            print("✓ PASSED: Batch rename")
+            self.passed += 1
+        else:
+            for failure in failures:
+                print(f"❌ FAILED: {failure}")
+            self.failed += 1
+    
     def print_summary(self):
         """Print test summary"""
         print("\n" + "="*60)
@@ -211,6 +423,10 @@ class AgentTester:
         # Core tests
         self.test_module_registration()
         self.test_llama_integration()
+        self.test_fuzzy_matching()
+        self.test_command_parser()
+        self.test_action_matching()
+        self.test_batch_rename()
         
         # Feature tests
         self.run_system_tests()